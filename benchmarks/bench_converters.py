@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Converter Benchmark Suite
+Times every converter over the real corpus, stage by stage.
+
+Each run happens in a fresh interpreter, so peak RSS and first-call costs
+(template loading, style setup) are measured the way a command-line run
+sees them. Stages are:
+
+    read   load the source text
+    parse  turn it into blocks / tables
+    build  build the output document in memory
+    save   serialize the package to disk
+
+Converters without a markdown source (the slide decks) only have build
+and save. Cold-start times are measured too: a bare interpreter, the
+govdocs CLI's --help, a docx run with nothing to rebuild, and importing
+each converter module.
+
+Results are printed as a table and can be written as JSON with the git
+commit they were taken at; --compare prints the change against a
+previous results file.
+
+Usage:
+    python benchmarks/bench_converters.py [-n REPEAT] [-o results.json]
+                                          [--compare baseline.json]
+                                          [--only docx,raci-xlsx,...]
+                                          [--no-cold-start]
+"""
+
+import argparse
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import ooxml_output  # noqa: E402
+
+STAGES = ('read', 'parse', 'build', 'save')
+
+
+class StageTimer:
+    """Accumulates wall-clock seconds per named stage."""
+
+    def __init__(self):
+        self.stages = {}
+        self._start = None
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._start
+        self._start = now
+
+
+def run_docx(source, output_path, timer):
+    import md_blocks
+    import md_to_docx
+
+    timer.start()
+    md_content = source.read_text(encoding='utf-8')
+    timer.lap('read')
+    blocks = md_blocks.parse(md_content)
+    timer.lap('parse')
+    # Without the fragment cache, so every run renders every section
+    fragments = list(md_to_docx.iter_section_fragments(blocks))
+    timer.lap('build')
+    md_to_docx.write_docx_package(output_path, fragments)
+    timer.lap('save')
+
+
+def run_raci_xlsx(source, output_path, timer):
+    from raci_to_excel import RACIExcelConverter
+
+    timer.start()
+    source.read_bytes()
+    timer.lap('read')
+    converter = RACIExcelConverter(source, output_path)
+    sections = converter.extract_tables_from_markdown()
+    timer.lap('parse')
+    converter.create_sheet_structure(sections)
+    timer.lap('build')
+    ooxml_output.save(converter.wb, output_path)
+    timer.lap('save')
+
+
+def run_charter_pptx(source, output_path, timer):
+    from coe_charter_to_pptx import CoEPresentationGenerator
+    _run_slides(CoEPresentationGenerator(output_path), timer)
+
+
+def run_exec_pptx(source, output_path, timer):
+    from coe_exec_summary_pptx import ExecPresentationGenerator
+    _run_slides(ExecPresentationGenerator(output_path), timer)
+
+
+def _run_slides(generator, timer):
+    timer.start()
+    generator.build_slides()
+    timer.lap('build')
+    ooxml_output.save(generator.prs, generator.output_path)
+    timer.lap('save')
+
+
+# name: (runner, output suffix, sources relative to the repo root or None)
+CONVERTERS = {
+    'docx': (run_docx, '.docx', 'drafts/*.md RACI-Matrix.md'),
+    'raci-xlsx': (run_raci_xlsx, '.xlsx', 'RACI-Matrix.md'),
+    'charter-pptx': (run_charter_pptx, '.pptx', None),
+    'exec-pptx': (run_exec_pptx, '.pptx', None),
+}
+
+
+def corpus_sources(converter):
+    """The source files a converter is benchmarked on; [None] if it has none."""
+    patterns = CONVERTERS[converter][2]
+    if patterns is None:
+        return [None]
+
+    sources = []
+    for pattern in patterns.split():
+        sources.extend(sorted(REPO_ROOT.glob(pattern)))
+    return sources
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_child(converter, source):
+    """Run one conversion in this process and print its result as JSON."""
+    runner, suffix, _ = CONVERTERS[converter]
+    source = Path(source) if source else None
+    timer = StageTimer()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = Path(tmp) / ('output' + suffix)
+        runner(source, output_path, timer)
+        output_bytes = output_path.stat().st_size
+
+    print(json.dumps({
+        'stages': timer.stages,
+        'peak_rss': peak_rss_bytes(),
+        'output_bytes': output_bytes,
+    }))
+
+
+def measure(converter, source, repeat):
+    """Run a conversion repeat times in fresh interpreters and summarize."""
+    runs = []
+    for _ in range(repeat):
+        cmd = [sys.executable, __file__, '--child', converter, str(source or '')]
+        result = subprocess.run(cmd, capture_output=True, text=True, cwd=REPO_ROOT)
+        if result.returncode != 0:
+            raise RuntimeError(f"{converter} failed on {source}:\n{result.stderr}")
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    stages = {
+        stage: statistics.median(run['stages'][stage] for run in runs)
+        for stage in STAGES if stage in runs[0]['stages']
+    }
+    return {
+        'converter': converter,
+        'source': str(source.relative_to(REPO_ROOT)) if source else None,
+        'stages': stages,
+        'total': sum(stages.values()),
+        'peak_rss': max(run['peak_rss'] for run in runs),
+        'output_bytes': runs[-1]['output_bytes'],
+        'repeat': repeat,
+    }
+
+
+# label: arguments to the interpreter, timed from process start to exit
+COLD_START = {
+    'interpreter': ['-c', 'pass'],
+    'govdocs --help': ['govdocs.py', '--help'],
+    'govdocs docx (up to date)': ['govdocs.py', 'docx', '-o', '{output_dir}'],
+    'import md_to_docx': ['-c', 'import md_to_docx'],
+    'import raci_to_excel': ['-c', 'import raci_to_excel'],
+    'import coe_charter_to_pptx': ['-c', 'import coe_charter_to_pptx'],
+    'import coe_exec_summary_pptx': ['-c', 'import coe_exec_summary_pptx'],
+}
+
+
+def measure_cold_start(repeat):
+    """Median wall-clock seconds for each COLD_START command."""
+    timings = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        # Build once so the timed docx runs find every output up to date
+        subprocess.run([sys.executable, 'govdocs.py', 'docx', '-o', output_dir],
+                       cwd=REPO_ROOT, capture_output=True, check=True)
+
+        for label, args in COLD_START.items():
+            cmd = [sys.executable] + [arg.format(output_dir=output_dir) for arg in args]
+            runs = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, check=True)
+                runs.append(time.perf_counter() - start)
+            timings[label] = statistics.median(runs)
+    return timings
+
+
+def git_commit():
+    """The current commit hash, with a -dirty suffix for uncommitted changes."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                                text=True, cwd=REPO_ROOT, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, cwd=REPO_ROOT).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('-dirty' if dirty else '')
+
+
+def result_key(result):
+    return f"{result['converter']}:{result['source'] or '-'}"
+
+
+def print_results(results, baseline=None):
+    """Print a table of results, with % change against a baseline if given."""
+    previous = {result_key(r): r for r in (baseline or {}).get('results', [])}
+
+    header = f"{'converter':<13}{'source':<52}"
+    header += ''.join(f'{stage:>9}' for stage in STAGES)
+    header += f"{'total':>9}{'rss MB':>9}{'out KB':>9}"
+    if baseline:
+        header += f"{'Δ total':>10}{'Δ rss':>9}"
+    print(header)
+    print('-' * len(header))
+
+    for result in results:
+        source = result['source'] or '-'
+        if len(source) > 50:
+            source = '…' + source[-49:]
+        line = f"{result['converter']:<13}{source:<52}"
+        for stage in STAGES:
+            value = result['stages'].get(stage)
+            line += f'{value * 1000:>7.1f}ms' if value is not None else f"{'':>9}"
+        line += f"{result['total'] * 1000:>7.1f}ms"
+        line += f"{result['peak_rss'] / 2**20:>9.1f}"
+        line += f"{result['output_bytes'] / 1024:>9.1f}"
+
+        before = previous.get(result_key(result))
+        if before:
+            line += f"{_change(before['total'], result['total']):>10}"
+            line += f"{_change(before['peak_rss'], result['peak_rss']):>9}"
+        print(line)
+
+
+def print_cold_start(timings, baseline=None):
+    """Print cold-start timings, with % change against a baseline if given."""
+    previous = (baseline or {}).get('cold_start', {})
+
+    print(f"\n{'cold start':<40}{'time':>10}" + (f"{'Δ':>10}" if baseline else ''))
+    for label, seconds in timings.items():
+        line = f"{label:<40}{seconds * 1000:>8.1f}ms"
+        if label in previous:
+            line += f"{_change(previous[label], seconds):>10}"
+        print(line)
+
+
+def _change(before, after):
+    if not before:
+        return 'n/a'
+    return f'{(after - before) / before * 100:+.1f}%'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the document converters over the corpus.')
+    parser.add_argument('-n', '--repeat', type=int, default=3,
+                        help='runs per conversion; stage times are medians (default: 3)')
+    parser.add_argument('-o', '--output', type=Path,
+                        help='write results as JSON to this file')
+    parser.add_argument('--compare', type=Path, metavar='BASELINE',
+                        help='show changes against a previous JSON results file')
+    parser.add_argument('--only', default=','.join(CONVERTERS),
+                        help='comma-separated converters to run (default: all)')
+    parser.add_argument('--no-cold-start', action='store_true',
+                        help='skip the cold-start measurements')
+    parser.add_argument('--child', nargs=2, metavar=('CONVERTER', 'SOURCE'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    converters = args.only.split(',')
+    for converter in converters:
+        if converter not in CONVERTERS:
+            parser.error(f"unknown converter '{converter}' (choose from {', '.join(CONVERTERS)})")
+
+    results = []
+    for converter in converters:
+        for source in corpus_sources(converter):
+            results.append(measure(converter, source, args.repeat))
+
+    cold_start = {} if args.no_cold_start else measure_cold_start(args.repeat)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+        'cold_start': cold_start,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"Comparing against {baseline.get('commit') or args.compare}")
+
+    print_results(results, baseline)
+    if cold_start:
+        print_cold_start(cold_start, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Inline Formatting Micro-Benchmark
+Compares md_blocks.inline_segments with the regex splitter it replaced.
+
+Reports the time for one pass and the number of runs each approach would
+emit, over the paragraphs and list items of the drafts corpus and over
+long synthetic lines dense with markup and unclosed delimiters.
+
+What to expect: over the corpus, where most text has little or no markup,
+the scanner is about twice as fast and emits fewer runs. On the synthetic
+lines it does Python work for every span, so it runs at about half the
+speed of the C-level re.split; both grow linearly with the line length,
+which the synthetic_repeats argument lets you check.
+
+Usage: python benchmarks/bench_inline.py [synthetic_repeats]
+"""
+
+import re
+import sys
+import timeit
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import md_blocks  # noqa: E402
+
+
+def legacy_inline_segments(text):
+    """The original process_inline_formatting splitter, one segment per fragment."""
+    parts = re.split(r'(\*\*\*.*?\*\*\*|\*\*.*?\*\*|\*.*?\*|`.*?`)', text)
+
+    segments = []
+    for part in parts:
+        if not part:
+            continue
+        if part.startswith('***') and part.endswith('***'):
+            segments.append((part[3:-3], 'bold_italic'))
+        elif part.startswith('**') and part.endswith('**'):
+            segments.append((part[2:-2], 'bold'))
+        elif part.startswith('*') and part.endswith('*') and len(part) > 2:
+            segments.append((part[1:-1], 'italic'))
+        elif part.startswith('`') and part.endswith('`'):
+            segments.append((part[1:-1], 'code'))
+        else:
+            segments.append((part, None))
+    return segments
+
+
+def corpus_texts():
+    """Paragraph and list item texts from every markdown source in the repo."""
+    texts = []
+    sources = sorted((REPO_ROOT / 'drafts').glob('*.md')) + [REPO_ROOT / 'RACI-Matrix.md']
+    for path in sources:
+        for block in md_blocks.parse(path.read_text(encoding='utf-8')):
+            if block.kind == md_blocks.PARAGRAPH:
+                texts.append(block.text)
+            elif block.kind in (md_blocks.BULLET_LIST, md_blocks.ORDERED_LIST):
+                texts.extend(block.items)
+    return texts
+
+
+def synthetic_texts(size):
+    """Single long lines dense with markup, including unclosed delimiters."""
+    return {
+        'unclosed bold': ['**' + 'word ' * size],
+        'stray asterisks': ['a * b ' * size],
+        'unclosed triple': ['***x** ' * size],
+        'alternating bold': ['**a** b ' * size],
+    }
+
+
+def bench(texts, repeat):
+    """Best-of-repeat seconds for one pass over texts, plus emitted run counts."""
+    results = {}
+    for name, func in (('legacy', legacy_inline_segments), ('scanner', md_blocks.inline_segments)):
+        seconds = min(timeit.repeat(lambda: [func(t) for t in texts], number=1, repeat=repeat))
+        runs = sum(len(func(t)) for t in texts)
+        results[name] = (seconds, runs)
+    return results
+
+
+def main():
+    """Run the benchmark and print a comparison table."""
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    cases = {'corpus': corpus_texts()}
+    cases.update(synthetic_texts(size))
+
+    print(f"{'case':<18} {'legacy ms':>10} {'scanner ms':>11} {'speedup':>8} {'legacy runs':>12} {'scanner runs':>13}")
+    print("-" * 77)
+    for name, texts in cases.items():
+        results = bench(texts, repeat=5)
+        legacy_s, legacy_runs = results['legacy']
+        scanner_s, scanner_runs = results['scanner']
+        print(f"{name:<18} {legacy_s * 1000:>10.2f} {scanner_s * 1000:>11.2f} "
+              f"{legacy_s / scanner_s:>7.1f}x {legacy_runs:>12} {scanner_runs:>13}")
+
+
+if __name__ == '__main__':
+    main()
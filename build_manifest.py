@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Build Manifest
+Records what each generated output was built from, so unchanged outputs can be skipped.
+"""
+
+import ast
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+MANIFEST_NAME = '.build-manifest.json'
+
+# Where the project modules hashed by code_hash() live
+MODULE_DIR = Path(__file__).resolve().parent
+
+
+def hash_bytes(data):
+    """Return the SHA-256 hex digest of a bytes object."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_settings(settings):
+    """Return a stable digest for a JSON-serializable settings object."""
+    return hash_bytes(json.dumps(settings, sort_keys=True).encode('utf-8'))
+
+
+_CODE_HASHES = {}
+
+
+def _project_imports(module):
+    """
+    Names of the project modules a module imports, at module level or
+    inside functions. A script's main() is skipped: it only hands its
+    command line over to govdocs.
+    """
+    names = set()
+    pending = [ast.parse((MODULE_DIR / f'{module}.py').read_bytes())]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.FunctionDef) and node.name == 'main':
+            continue
+        pending.extend(ast.iter_child_nodes(node))
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+    return {name for name in names if (MODULE_DIR / f'{name}.py').is_file()}
+
+
+def code_hash(module):
+    """
+    Hash of a project module's source file and of every project module it
+    imports, directly or through another, so a fingerprint that includes
+    it changes with shared code such as md_blocks or ooxml_output too.
+    """
+    if module not in _CODE_HASHES:
+        modules = set()
+        pending = [module]
+        while pending:
+            name = pending.pop()
+            if name not in modules:
+                modules.add(name)
+                pending.extend(_project_imports(name))
+        _CODE_HASHES[module] = hash_settings({name: hash_file(MODULE_DIR / f'{name}.py')
+                                              for name in sorted(modules)})
+    return _CODE_HASHES[module]
+
+
+class BuildManifest:
+    """
+    Persistent per-output record of source hash and build settings.
+
+    Entries are keyed by output file name relative to the manifest's directory.
+    Each entry stores a fingerprint dict (source hash, converter version, style
+    settings, ...) plus the source's size and mtime when it was hashed, which
+    let unchanged sources skip re-hashing on the next run.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        self.dirty = False
+        self.hashed_stats = {}  # output key: source [size, mtime_ns] when source_hash() hashed it
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('outputs', {})
+            except (OSError, ValueError):
+                # A corrupt manifest just means everything gets rebuilt
+                self.entries = {}
+
+    @classmethod
+    def for_directory(cls, output_dir):
+        """Open the manifest stored alongside the outputs in output_dir."""
+        return cls(Path(output_dir) / MANIFEST_NAME)
+
+    def _key(self, output_path):
+        return Path(output_path).name
+
+    def source_hash(self, source_path, output_path):
+        """
+        Hash a source file, reusing the recorded hash if its size and mtime
+        are unchanged since the last build of output_path.
+
+        The size and mtime are taken before hashing and are what record()
+        stores, so a source saved during the build doesn't get its new stat
+        paired with the old hash.
+        """
+        stat = os.stat(source_path)
+        key = self._key(output_path)
+        self.hashed_stats[key] = [stat.st_size, stat.st_mtime_ns]
+        entry = self.entries.get(key)
+        if entry and entry.get('source_stat') == self.hashed_stats[key]:
+            return entry['fingerprint']['source_sha256']
+        return hash_file(source_path)
+
+    def is_up_to_date(self, output_path, fingerprint):
+        """True if output_path exists and was last built with this fingerprint."""
+        entry = self.entries.get(self._key(output_path))
+        return bool(entry) and entry['fingerprint'] == fingerprint and Path(output_path).exists()
+
+    def record(self, output_path, fingerprint, source_path=None):
+        """Record a successful build of output_path."""
+        key = self._key(output_path)
+        entry = {'fingerprint': fingerprint}
+        if key in self.hashed_stats:
+            entry['source_stat'] = self.hashed_stats.pop(key)
+        elif source_path is not None:
+            stat = os.stat(source_path)
+            entry['source_stat'] = [stat.st_size, stat.st_mtime_ns]
+        self.entries[key] = entry
+        self.dirty = True
+
+    def forget(self, output_path):
+        """Drop the entry for output_path so it is rebuilt next time."""
+        if self.entries.pop(self._key(output_path), None) is not None:
+            self.dirty = True
+
+    def save(self):
+        """Write the manifest atomically if anything changed."""
+        if not self.dirty:
+            return
+
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'outputs': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
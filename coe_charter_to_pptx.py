@@ -4,6 +4,7 @@ AI/ML Center of Excellence Charter - PowerPoint Generator
 Creates a professional presentation from the CoE Charter document.
 """
 
+import sys
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
@@ -11,15 +12,20 @@ from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
 from pathlib import Path
 
+import instrumentation
+import ooxml_output
+
 
 class CoEPresentationGenerator:
     """Generates a PowerPoint presentation for the CoE Charter."""
 
-    def __init__(self, output_path):
+    def __init__(self, output_path, compression='default'):
         self.prs = Presentation()
         self.prs.slide_width = Inches(13.333)  # 16:9 aspect ratio
         self.prs.slide_height = Inches(7.5)
-        self.output_path = Path(output_path)
+        # A path, a binary file-like object, or None for bytes (see ooxml_output)
+        self.output_path = Path(output_path) if ooxml_output.is_path(output_path) else output_path
+        self.compression = compression  # see ooxml_output
 
         # Brand colors
         self.PRIMARY_BLUE = RGBColor(0, 51, 102)
@@ -470,10 +476,8 @@ class CoEPresentationGenerator:
             p.font.size = Pt(12)
             p.font.color.rgb = self.DARK_GRAY
 
-    def generate(self):
-        """Generate the full presentation."""
-        print("Generating CoE Charter PowerPoint presentation...")
-
+    def build_slides(self):
+        """Add every slide of the presentation."""
         # Slide 1: Title
         self.add_title_slide(
             "AI/ML Center of Excellence",
@@ -777,22 +781,38 @@ class CoEPresentationGenerator:
         p.font.color.rgb = self.ACCENT_ORANGE
         p.alignment = PP_ALIGN.CENTER
 
-        # Save
-        self.prs.save(self.output_path)
-        print(f"✓ Presentation saved: {self.output_path}")
-        print(f"  File size: {self.output_path.stat().st_size / 1024:.1f} KB")
-        print(f"  Total slides: {len(self.prs.slides)}")
+    def generate(self):
+        """
+        Generate the full presentation.
+
+        Returns what ooxml_output.save does: the presentation bytes if
+        output_path is None, else output_path.
+        """
+        print("Generating CoE Charter PowerPoint presentation...")
 
+        with instrumentation.document(ooxml_output.target_name(self.output_path, 'presentation.pptx')):
+            with instrumentation.stage('build'):
+                self.build_slides()
+
+            # Save
+            with instrumentation.stage('save'):
+                saved = ooxml_output.save(self.prs, self.output_path, self.compression)
+        if ooxml_output.is_path(self.output_path):
+            print(f"✓ Presentation saved: {self.output_path}")
+            print(f"  File size: {self.output_path.stat().st_size / 1024:.1f} KB")
+        else:
+            print("✓ Presentation saved")
+        print(f"  Total slides: {len(self.prs.slides)}")
+        return saved
 
-def main():
-    """Main function to generate the presentation."""
-    output_path = Path('/Users/govind/AIEngineering/governance-docs-word/12-AI-ML-Center-of-Excellence-Charter.pptx')
 
-    generator = CoEPresentationGenerator(output_path)
-    generator.generate()
+def main(argv=None):
+    """Main function to generate the presentation (the `govdocs charter-pptx` command)."""
+    import govdocs
 
-    print("\nPresentation generation complete!")
+    argv = sys.argv[1:] if argv is None else list(argv)
+    return govdocs.main(['charter-pptx', *argv])
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -4,6 +4,7 @@ AI/ML Center of Excellence - Executive Summary PowerPoint
 Concise presentation for executive management (10-12 slides).
 """
 
+import sys
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
@@ -11,15 +12,20 @@ from pptx.enum.text import PP_ALIGN
 from pptx.enum.shapes import MSO_SHAPE
 from pathlib import Path
 
+import instrumentation
+import ooxml_output
+
 
 class ExecPresentationGenerator:
     """Generates an executive summary presentation."""
 
-    def __init__(self, output_path):
+    def __init__(self, output_path, compression='default'):
         self.prs = Presentation()
         self.prs.slide_width = Inches(13.333)
         self.prs.slide_height = Inches(7.5)
-        self.output_path = Path(output_path)
+        # A path, a binary file-like object, or None for bytes (see ooxml_output)
+        self.output_path = Path(output_path) if ooxml_output.is_path(output_path) else output_path
+        self.compression = compression  # see ooxml_output
 
         # Brand colors
         self.PRIMARY = RGBColor(0, 51, 102)
@@ -781,10 +787,8 @@ class ExecPresentationGenerator:
         p.font.color.rgb = RGBColor(180, 180, 180)
         p.alignment = PP_ALIGN.CENTER
 
-    def generate(self):
-        """Generate the executive summary presentation."""
-        print("Generating Executive Summary presentation...")
-
+    def build_slides(self):
+        """Add every slide of the presentation."""
         self.add_title_slide()              # 1
         self.add_why_slide()                # 2
         self.add_value_prop_slide()         # 3
@@ -797,18 +801,37 @@ class ExecPresentationGenerator:
         self.add_summary_slide()            # 10
         self.add_closing_slide()            # 11
 
-        self.prs.save(self.output_path)
-        print(f"✓ Presentation saved: {self.output_path}")
-        print(f"  File size: {self.output_path.stat().st_size / 1024:.1f} KB")
+    def generate(self):
+        """
+        Generate the executive summary presentation.
+
+        Returns what ooxml_output.save does: the presentation bytes if
+        output_path is None, else output_path.
+        """
+        print("Generating Executive Summary presentation...")
+
+        with instrumentation.document(ooxml_output.target_name(self.output_path, 'presentation.pptx')):
+            with instrumentation.stage('build'):
+                self.build_slides()
+
+            with instrumentation.stage('save'):
+                saved = ooxml_output.save(self.prs, self.output_path, self.compression)
+        if ooxml_output.is_path(self.output_path):
+            print(f"✓ Presentation saved: {self.output_path}")
+            print(f"  File size: {self.output_path.stat().st_size / 1024:.1f} KB")
+        else:
+            print("✓ Presentation saved")
         print(f"  Total slides: {len(self.prs.slides)}")
+        return saved
+
 
+def main(argv=None):
+    """Generate the executive summary presentation (the `govdocs exec-pptx` command)."""
+    import govdocs
 
-def main():
-    output_path = Path('/Users/govind/AIEngineering/governance-docs-word/12-AI-ML-CoE-Executive-Summary.pptx')
-    generator = ExecPresentationGenerator(output_path)
-    generator.generate()
-    print("\nExecutive presentation complete!")
+    argv = sys.argv[1:] if argv is None else list(argv)
+    return govdocs.main(['exec-pptx', *argv])
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Content Cache
+A directory of immutable byte blobs keyed by content hash, bounded in size.
+
+Entries never change once written: a key is derived from everything the
+blob depends on, so a changed input simply means a new key. That makes a
+cache directory safe to share between concurrent processes - writes are
+atomic renames, and a missing or half-written entry reads as a miss.
+When the directory grows past its size limit, evict() removes the least
+recently used entries.
+
+Keeping the cache cheap when it is mostly hits:
+- A hit refreshes an entry's mtime, which is its LRU position, only when
+  the mtime is older than REFRESH_SECONDS.
+- The total size of each directory is kept as a running total per
+  process, measured by one scan the first time it is needed.
+- evict() does nothing unless a put() has added bytes, and rescans the
+  directory only once the total is over the limit.
+Entries written by other processes aren't in this process's total until
+its next scan, so the limit is approximate between scans.
+"""
+
+import os
+import time
+from pathlib import Path
+
+
+# A hit only moves an entry up the LRU order if it was last used longer ago than this
+REFRESH_SECONDS = 3600
+
+# (resolved directory, suffix): total bytes of the entries, as far as this process knows
+_directory_sizes = {}
+
+
+class ContentCache:
+    """Byte blobs stored under string keys in a directory, with LRU eviction."""
+
+    def __init__(self, directory, max_bytes, suffix=''):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.added = False  # whether a put() since the last evict() grew the cache
+        self._size_key = (str(self.directory.resolve()), suffix)
+
+    def _path(self, key):
+        return self.directory / f'{key}{self.suffix}'
+
+    def get(self, key):
+        """Return the blob stored under key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+                last_used = os.fstat(f.fileno()).st_mtime
+        except OSError:
+            return None
+
+        if time.time() - last_used > REFRESH_SECONDS:
+            try:
+                # Mark the entry as recently used for eviction
+                os.utime(path)
+            except OSError:
+                pass
+        return data
+
+    def put(self, key, data):
+        """Store a blob under key. Call evict() once a batch of puts is done."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        path = self._path(key)
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        if self._size_key in _directory_sizes:
+            _directory_sizes[self._size_key] += len(data) - replaced
+        if len(data) > replaced:
+            self.added = True
+
+    def size(self):
+        """Total bytes of the entries, scanning the directory only the first time."""
+        if self._size_key not in _directory_sizes:
+            _directory_sizes[self._size_key] = sum(size for _, size, _ in self._entries())
+        return _directory_sizes[self._size_key]
+
+    def _entries(self):
+        """(mtime_ns, size, path) of every entry."""
+        entries = []
+        for path in self.directory.glob(f'*{self.suffix}'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """
+        Delete least recently used entries until the cache fits in max_bytes.
+
+        Only does work if a put() since the last call grew the cache past
+        max_bytes.
+        """
+        if not self.added:
+            return
+        self.added = False
+        if self.size() <= self.max_bytes:
+            return
+
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        _directory_sizes[self._size_key] = total
+
+    def clear(self):
+        """Delete every entry."""
+        for _, _, path in self._entries():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        _directory_sizes[self._size_key] = 0
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Word Output Settings
+Converter version and style settings that determine the generated .docx files.
+
+Kept apart from md_to_docx so the build driver can decide which documents
+are stale without importing python-docx.
+"""
+
+import md_blocks
+from build_manifest import code_hash, hash_settings
+from ooxml_output import source_date_epoch
+
+
+# Bump to mark every generated document and cached section stale by hand;
+# changes to the converter's code are picked up by its code hash
+CONVERTER_VERSION = '2.3'
+
+# Heading style overrides: style name -> (font size in pt, RGB color)
+HEADING_STYLES = {
+    'Heading 1': (18, (0, 51, 102)),
+    'Heading 2': (16, (0, 76, 153)),
+    'Heading 3': (14, (51, 102, 153)),
+    'Heading 4': (12, (51, 102, 153)),
+}
+
+
+def build_fingerprint(source_hash, compression='default'):
+    """Everything a generated document depends on, for the build manifest."""
+    return {
+        'source_sha256': source_hash,
+        'converter_version': CONVERTER_VERSION,
+        'code_sha256': code_hash('md_to_docx'),
+        'parser_version': md_blocks.PARSER_VERSION,
+        'styles': hash_settings(HEADING_STYLES),
+        'compression': compression,
+        'source_date_epoch': source_date_epoch(),
+    }
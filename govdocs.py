@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+Governance Document Builder
+One command line for every converter in the repository.
+
+    python govdocs.py docx [SOURCE ...] [-o OUTPUT_DIR]
+    python govdocs.py raci-xlsx [SOURCE] [-o OUTPUT]
+    python govdocs.py raci-roles [SOURCE] [-o OUTPUT_DIR] [--role ROLE ...]
+    python govdocs.py raci-validate [SOURCE] [-o REPORT]
+    python govdocs.py raci-overlay [SOURCE] [-o OUTPUT_DIR]
+    python govdocs.py tables [SOURCE ...] [-o OUTPUT_DIR] [-j JOBS]
+    python govdocs.py charter-pptx [-o OUTPUT]
+    python govdocs.py exec-pptx [-o OUTPUT]
+    python govdocs.py build [-o OUTPUT_DIR] [-j JOBS]
+
+Paths default to the drafts, RACI matrix and governance-docs-word folder
+of this repository. `build` is the full release build: every output, from
+one parse per source (see pipeline.py).
+
+Each subcommand imports only the backend it runs, and only once there is
+work to do: --help, and a docx run with every output up to date, never
+load python-docx, openpyxl or python-pptx.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import instrumentation
+import ooxml_output
+
+
+REPO_ROOT = Path(__file__).resolve().parent
+DRAFTS_DIR = REPO_ROOT / 'drafts'
+RACI_SOURCE = REPO_ROOT / 'RACI-Matrix.md'
+OUTPUT_DIR = REPO_ROOT / 'governance-docs-word'
+ROLE_WORKBOOKS_DIR = 'RACI-by-role'
+TABLES_DIR = 'tables'
+
+CHARTER_SOURCE = '12-AI-ML-Center-of-Excellence-Charter.md'
+CHARTER_PPTX = '12-AI-ML-Center-of-Excellence-Charter.pptx'
+EXEC_PPTX = '12-AI-ML-CoE-Executive-Summary.pptx'
+
+
+def collect_sources(sources):
+    """Expand files and directories of markdown into a sorted list of files."""
+    md_files = []
+    for source in sources:
+        source = Path(source)
+        if source.is_dir():
+            md_files.extend(sorted(source.glob('*.md')))
+        else:
+            md_files.append(source)
+    return md_files
+
+
+def run_docx(args):
+    """Convert markdown files to Word documents, skipping up-to-date outputs."""
+    import time
+    from build_manifest import BuildManifest
+    from docx_settings import build_fingerprint
+
+    md_files = collect_sources(args.sources)
+    missing = [md_file for md_file in md_files if not md_file.is_file()]
+    if missing:
+        for md_file in missing:
+            print(f"Error: Source file not found: {md_file}")
+        return 1
+
+    output_dir = args.output_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"Found {len(md_files)} markdown files to convert")
+    print("-" * 50)
+
+    start = time.perf_counter()
+
+    # Skip outputs whose source and build settings haven't changed
+    manifest = BuildManifest.for_directory(output_dir)
+    fingerprints = {}
+    stale_files = []
+    for md_file in md_files:
+        output_path = output_dir / (md_file.stem + '.docx')
+        fingerprint = build_fingerprint(manifest.source_hash(md_file, output_path), args.compression)
+        fingerprints[md_file] = fingerprint
+        if not args.force and manifest.is_up_to_date(output_path, fingerprint):
+            continue
+        stale_files.append(md_file)
+
+    skipped = len(md_files) - len(stale_files)
+    if skipped:
+        print(f"Skipping {skipped} up-to-date files (use --force to rebuild)")
+
+    results = []
+    if stale_files:
+        import md_to_docx
+        if args.force:
+            # A forced rebuild renders every section again, not just every document
+            md_to_docx.clear_fragment_cache()
+        results = md_to_docx.convert_batch(stale_files, output_dir, jobs=args.jobs, stream=args.stream,
+                                           compression=args.compression)
+
+    for md_file, output_path, error in results:
+        if error is None:
+            manifest.record(output_path, fingerprints[md_file], md_file)
+        else:
+            manifest.forget(output_path)
+    manifest.save()
+
+    elapsed = time.perf_counter() - start
+    failed = [md_file.name for md_file, _, error in results if error is not None]
+
+    print("-" * 50)
+    print(f"Conversion complete! Files saved to: {output_dir}")
+    print(f"  {len(results) - len(failed)} converted, {skipped} up to date, "
+          f"{len(failed)} failed in {elapsed:.2f}s")
+    for name in failed:
+        print(f"  ✗ {name}")
+
+    if args.watch:
+        import watcher
+        watcher.watch([watcher.docx_rule(path, output_dir, args.stream, args.compression)
+                       for path in _watch_dirs(args.sources)])
+
+    return 1 if failed else 0
+
+
+def _watch_dirs(sources):
+    """Directories to watch for a docx run: each source directory, or a file's parent."""
+    dirs = []
+    for source in sources:
+        source = Path(source)
+        directory = source if source.is_dir() else source.parent
+        if directory not in dirs:
+            dirs.append(directory)
+    return dirs
+
+
+def run_raci_xlsx(args):
+    """Convert the RACI matrix markdown to an Excel workbook."""
+    if not args.source.exists():
+        print(f"Error: Source file not found: {args.source}")
+        return 1
+
+    from raci_to_excel import RACIExcelConverter, SectionNotFoundError
+
+    output_file = args.output or OUTPUT_DIR / (args.source.stem + '.xlsx')
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    options = {
+        'compression': args.compression,
+        'streaming': args.stream,
+        'color_rules': args.color_rules,
+        'validation_sheet': args.validation_sheet,
+        'effective_sheets': args.effective_sheets,
+    }
+    converter = RACIExcelConverter(args.source, output_file, **options)
+    try:
+        converter.convert()
+    except SectionNotFoundError as e:
+        print(f"Error: {e}")
+        return 1
+
+    print("\nConversion complete!")
+    print(f"Open the file: {output_file}")
+
+    if args.watch:
+        import watcher
+        watcher.watch([watcher.raci_xlsx_rule(args.source, output_file, **options)])
+
+    return 0
+
+
+def run_raci_roles(args):
+    """Write one RACI workbook per role, with only that role's activities."""
+    import time
+
+    if not args.source.exists():
+        print(f"Error: Source file not found: {args.source}")
+        return 1
+
+    from raci_to_excel import convert_per_role
+
+    output_dir = args.output_dir or OUTPUT_DIR / ROLE_WORKBOOKS_DIR
+    start = time.perf_counter()
+    try:
+        results = convert_per_role(args.source, output_dir, roles=args.roles, jobs=args.jobs,
+                                   compression=args.compression)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    print("-" * 50)
+    for role, output_path, error in results:
+        if error is None:
+            print(f"  ✓ {role}: {output_path.name}")
+        else:
+            print(f"  ✗ {role}: {error}")
+
+    failed = [role for role, _, error in results if error is not None]
+    print(f"Role workbooks saved to: {output_dir}")
+    print(f"  {len(results) - len(failed)} written, {len(failed)} failed in {elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+def run_raci_validate(args):
+    """Check the RACI matrix tables for structural errors."""
+    if not args.source.exists():
+        print(f"Error: Source file not found: {args.source}")
+        return 1
+
+    import raci_model
+    import raci_validation
+
+    with instrumentation.document(args.source.stem + '-validation', source=str(args.source)):
+        with instrumentation.stage('parse'):
+            model = raci_model.load(args.source)
+        with instrumentation.stage('validate'):
+            findings = raci_validation.validate(model)
+
+    print(f"Validated {len(model)} activities x {len(model.roles)} roles in {args.source.name}")
+    print("-" * 50)
+    for finding in findings:
+        print(f"  {finding.severity}: {finding.section}: {finding.message}")
+
+    summary = raci_validation.summarize(findings)
+    print("-" * 50)
+    print(f"  {summary['errors']} errors, {summary['warnings']} warnings")
+
+    if args.output:
+        raci_validation.write_report(findings, args.output, source=args.source.name, model=model)
+        print(f"Report saved to: {args.output}")
+
+    return 1 if summary['errors'] else 0
+
+
+def run_raci_overlay(args):
+    """Compute the effective RACI of every initiative type x tier."""
+    import csv
+    import time
+
+    if not args.source.exists():
+        print(f"Error: Source file not found: {args.source}")
+        return 1
+
+    import raci_overlay
+    import raci_validation
+    from raci_model import format_code
+
+    with instrumentation.document(args.source.stem + '-overlay', source=str(args.source)):
+        with instrumentation.stage('overlay'):
+            start = time.perf_counter()
+            overlay = raci_overlay.load(args.source)
+            elapsed = time.perf_counter() - start
+
+    model = overlay.model
+    print(f"{len(overlay.combinations())} combinations of {len(model)} activities x {len(model.roles)} roles "
+          f"in {elapsed * 1000:.1f} ms")
+    print("-" * 50)
+    if args.output_dir:
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+    for initiative_type, tier in overlay.combinations():
+        title = raci_overlay.combination_title(initiative_type, tier)
+        combination = overlay.combination(initiative_type, tier)
+        summary = raci_validation.summarize(raci_validation.validate(combination))
+        print(f"  {title}: {len(combination)} activities, "
+              f"{summary['errors']} errors, {summary['warnings']} warnings")
+
+        if args.output_dir:
+            with open(args.output_dir / f'{args.source.stem}-{title}.csv', 'w', newline='',
+                      encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['Section', 'Subsection', 'Activity', *combination.roles])
+                for row, activity in enumerate(combination.activities):
+                    writer.writerow([combination.sections[combination.section_ids[row]],
+                                     combination.subsections[combination.subsection_ids[row]], activity,
+                                     *(format_code(int(bits)) for bits in combination.codes[row])])
+
+    if args.output_dir:
+        print(f"Effective RACI saved to: {args.output_dir}")
+    return 0
+
+
+def run_tables(args):
+    """Extract every markdown table into one columnar file."""
+    import time
+
+    md_files = collect_sources(args.sources)
+    missing = [md_file for md_file in md_files if not md_file.is_file()]
+    if missing:
+        for md_file in missing:
+            print(f"Error: Source file not found: {md_file}")
+        return 1
+
+    import table_extract
+
+    output_dir = args.output_dir or OUTPUT_DIR / TABLES_DIR
+    start = time.perf_counter()
+    try:
+        store_path, results = table_extract.extract_corpus(md_files, output_dir, jobs=args.jobs,
+                                                           fmt=args.format, force=args.force)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    failed = [(md_file, error) for md_file, error in results if error is not None]
+    print(f"Extracted {len(results) - len(failed)} of {len(md_files)} documents "
+          f"({len(md_files) - len(results)} up to date) in {elapsed:.2f}s")
+    for md_file, error in failed:
+        print(f"  ✗ {md_file.name}: {error}")
+    if failed:
+        return 1
+
+    print(f"Tables saved to: {store_path}")
+    return 0
+
+
+def run_charter_pptx(args):
+    """Generate the CoE Charter presentation."""
+    from coe_charter_to_pptx import CoEPresentationGenerator
+
+    output_path = args.output or OUTPUT_DIR / CHARTER_PPTX
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    generator = CoEPresentationGenerator(output_path, args.compression)
+    generator.generate()
+
+    print("\nPresentation generation complete!")
+    return 0
+
+
+def run_exec_pptx(args):
+    """Generate the CoE executive summary presentation."""
+    from coe_exec_summary_pptx import ExecPresentationGenerator
+
+    output_path = args.output or OUTPUT_DIR / EXEC_PPTX
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    generator = ExecPresentationGenerator(output_path, args.compression)
+    generator.generate()
+
+    print("\nExecutive presentation complete!")
+    return 0
+
+
+def release_targets(drafts_dir, raci_source, output_dir):
+    """Every output of a release build, as pipeline Targets."""
+    from pipeline import Target
+
+    targets = []
+    for md_file in sorted(Path(drafts_dir).glob('*.md')):
+        targets.append(Target('docx', md_file, output_dir / (md_file.stem + '.docx')))
+        if md_file.name == CHARTER_SOURCE:
+            targets.append(Target('charter-pptx', md_file, output_dir / CHARTER_PPTX))
+            targets.append(Target('exec-pptx', md_file, output_dir / EXEC_PPTX))
+
+    raci_source = Path(raci_source)
+    targets.append(Target('docx', raci_source, output_dir / (raci_source.stem + '.docx')))
+    targets.append(Target('raci-xlsx', raci_source, output_dir / (raci_source.stem + '.xlsx')))
+    return targets
+
+
+def run_build(args):
+    """Build every document, parsing each source once."""
+    import time
+    import pipeline
+
+    for source in (args.drafts_dir, args.raci):
+        if not source.exists():
+            print(f"Error: Source not found: {source}")
+            return 1
+
+    start = time.perf_counter()
+    targets = release_targets(args.drafts_dir, args.raci, args.output_dir)
+    results = pipeline.build(targets, jobs=args.jobs, force=args.force, compression=args.compression)
+    elapsed = time.perf_counter() - start
+
+    failed = [target.output.name for target, error in results if error is not None]
+    print("-" * 50)
+    print(f"Build complete! Files saved to: {args.output_dir}")
+    print(f"  {len(results) - len(failed)} built, {len(targets) - len(results)} up to date, "
+          f"{len(failed)} failed in {elapsed:.2f}s")
+    for name in failed:
+        print(f"  ✗ {name}")
+
+    return 1 if failed else 0
+
+
+def build_parser():
+    """The argparse parser for all subcommands."""
+    parser = argparse.ArgumentParser(prog='govdocs', description='Build the governance documents.')
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+
+    docx = commands.add_parser('docx', help='convert markdown drafts to Word documents',
+                               description='Convert markdown drafts to Word documents.')
+    docx.add_argument('sources', nargs='*', type=Path, default=[DRAFTS_DIR], metavar='SOURCE',
+                      help=f'markdown files or directories (default: {DRAFTS_DIR.name}/)')
+    docx.add_argument('-o', '--output-dir', type=Path, default=OUTPUT_DIR,
+                      help=f'directory for the .docx files (default: {OUTPUT_DIR.name}/)')
+    docx.add_argument('-j', '--jobs', type=int, default=1,
+                      help='number of worker processes (0 = one per CPU core, default: 1)')
+    docx.add_argument('-f', '--force', action='store_true',
+                      help='rebuild every document, even if it is up to date, '
+                           'without reusing cached sections')
+    docx.add_argument('--stream', action='store_true',
+                      help='convert block by block in constant memory (for very large sources)')
+    docx.add_argument('-w', '--watch', action='store_true',
+                      help='after converting, stay resident and reconvert sources as they change')
+    docx.set_defaults(run=run_docx)
+
+    raci = commands.add_parser('raci-xlsx', help='convert the RACI matrix to an Excel workbook',
+                               description='Convert the RACI matrix markdown to an Excel workbook.')
+    raci.add_argument('source', nargs='?', type=Path, default=RACI_SOURCE,
+                      help=f'RACI matrix markdown (default: {RACI_SOURCE.name})')
+    raci.add_argument('-o', '--output', type=Path,
+                      help=f'workbook to write (default: {OUTPUT_DIR.name}/<source name>.xlsx)')
+    raci.add_argument('--stream', action='store_true',
+                      help='write rows as they are produced, in constant memory (for very large matrices)')
+    raci.add_argument('--color-rules', action='store_true',
+                      help='color RACI codes with conditional formatting rules instead of cell fills, '
+                           'so colors follow codes edited in Excel')
+    raci.add_argument('--validation-sheet', action='store_true',
+                      help='add a Validation sheet listing the findings of raci-validate')
+    raci.add_argument('--effective-sheets', action='store_true',
+                      help='add a sheet per initiative type x tier with its effective RACI (see raci-overlay)')
+    raci.add_argument('-w', '--watch', action='store_true',
+                      help='after converting, stay resident and reconvert when the source changes')
+    raci.set_defaults(run=run_raci_xlsx)
+
+    roles = commands.add_parser('raci-roles', help='write one RACI workbook per role',
+                                description="Write each role's view of the RACI matrix: a workbook with "
+                                            "only the activities the role is R, A, C or I for.")
+    roles.add_argument('source', nargs='?', type=Path, default=RACI_SOURCE,
+                       help=f'RACI matrix markdown (default: {RACI_SOURCE.name})')
+    roles.add_argument('-o', '--output-dir', type=Path,
+                       help=f'directory for the workbooks (default: {OUTPUT_DIR.name}/{ROLE_WORKBOOKS_DIR}/)')
+    roles.add_argument('--role', dest='roles', action='append', metavar='ROLE',
+                       help='role abbreviation to write a workbook for; repeat for several '
+                            '(default: every role in the matrix)')
+    roles.add_argument('-j', '--jobs', type=int, default=0,
+                       help='number of worker processes (0 = one per CPU core, default: 0)')
+    roles.set_defaults(run=run_raci_roles)
+
+    validate = commands.add_parser('raci-validate', help='check the RACI matrix tables for structural errors',
+                                   description='Check every RACI table for activities without exactly one '
+                                               'Accountable or without a Responsible, unknown roles and '
+                                               'invalid codes. Exits with status 1 if there are errors.')
+    validate.add_argument('source', nargs='?', type=Path, default=RACI_SOURCE,
+                          help=f'RACI matrix markdown (default: {RACI_SOURCE.name})')
+    validate.add_argument('-o', '--output', type=Path,
+                          help='also write the findings as a JSON report to this file')
+    validate.set_defaults(run=run_raci_validate)
+
+    overlay = commands.add_parser('raci-overlay', help='compute the effective RACI of each initiative type and tier',
+                                  description='Apply the initiative type and tier variations of the RACI matrix '
+                                              'to its tables, for every initiative type x tier, and report '
+                                              'each combination. Results are cached until the source changes.')
+    overlay.add_argument('source', nargs='?', type=Path, default=RACI_SOURCE,
+                         help=f'RACI matrix markdown (default: {RACI_SOURCE.name})')
+    overlay.add_argument('-o', '--output-dir', type=Path,
+                         help='also write each combination as a CSV file to this directory')
+    overlay.set_defaults(run=run_raci_overlay)
+
+    tables = commands.add_parser('tables', help='extract every markdown table into one columnar file',
+                                 description='Extract every table of the markdown sources, with the document, '
+                                             'section and subsection it is in, into one Parquet file (CSV '
+                                             'without pyarrow). Only documents changed since the last run '
+                                             'are extracted again.')
+    tables.add_argument('sources', nargs='*', type=Path, default=[DRAFTS_DIR, RACI_SOURCE], metavar='SOURCE',
+                        help=f'markdown files or directories (default: {DRAFTS_DIR.name}/ and {RACI_SOURCE.name})')
+    tables.add_argument('-o', '--output-dir', type=Path,
+                        help=f'directory for the table file (default: {OUTPUT_DIR.name}/{TABLES_DIR}/)')
+    tables.add_argument('--format', choices=['auto', 'parquet', 'csv'], default='auto',
+                        help='file format (default: parquet if pyarrow is installed, else csv)')
+    tables.add_argument('-j', '--jobs', type=int, default=0,
+                        help='number of worker processes (0 = one per CPU core, default: 0)')
+    tables.add_argument('-f', '--force', action='store_true',
+                        help='extract every document, even if it is up to date')
+    tables.set_defaults(run=run_tables)
+
+    charter = commands.add_parser('charter-pptx', help='generate the CoE Charter presentation',
+                                  description='Generate the CoE Charter PowerPoint presentation.')
+    charter.add_argument('-o', '--output', type=Path,
+                         help=f'presentation to write (default: {OUTPUT_DIR.name}/{CHARTER_PPTX})')
+    charter.set_defaults(run=run_charter_pptx)
+
+    summary = commands.add_parser('exec-pptx', help='generate the CoE executive summary presentation',
+                                  description='Generate the CoE executive summary presentation.')
+    summary.add_argument('-o', '--output', type=Path,
+                         help=f'presentation to write (default: {OUTPUT_DIR.name}/{EXEC_PPTX})')
+    summary.set_defaults(run=run_exec_pptx)
+
+    build = commands.add_parser('build', help='build every document from one parse per source',
+                                description='Release build: every draft to .docx, the RACI matrix to '
+                                            '.docx and .xlsx, and the CoE charter presentations.')
+    build.add_argument('--drafts-dir', type=Path, default=DRAFTS_DIR,
+                       help=f'directory of markdown drafts (default: {DRAFTS_DIR.name}/)')
+    build.add_argument('--raci', type=Path, default=RACI_SOURCE,
+                       help=f'RACI matrix markdown (default: {RACI_SOURCE.name})')
+    build.add_argument('-o', '--output-dir', type=Path, default=OUTPUT_DIR,
+                       help=f'directory for generated documents (default: {OUTPUT_DIR.name}/)')
+    build.add_argument('-j', '--jobs', type=int, default=0,
+                       help='number of worker processes (0 = one per CPU core, default: 0)')
+    build.add_argument('-f', '--force', action='store_true',
+                       help='rebuild every document, even if it is up to date, '
+                            'without reusing cached sections')
+    build.set_defaults(run=run_build)
+
+    for command in (docx, raci, roles, charter, summary, build):
+        ooxml_output.add_arguments(command)
+    for command in (docx, raci, roles, validate, overlay, tables, charter, summary, build):
+        instrumentation.add_arguments(command)
+
+    return parser
+
+
+def main(argv=None):
+    """Run a govdocs subcommand; returns the process exit status."""
+    args = build_parser().parse_args(argv)
+    instrumentation.configure_from_args(args)
+    if 'compression' in args:
+        ooxml_output.configure_from_args(args)
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
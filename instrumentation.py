@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Conversion Instrumentation
+Per-stage timers, optional cProfile capture and a JSON report per document.
+
+Converters wrap each output in document() and each step in stage():
+
+    with instrumentation.document(output_path.name):
+        with instrumentation.stage('parse'):
+            ...
+        with instrumentation.stage('save'):
+            ...
+
+When enabled with configure(), every document writes <name>.json to the
+report directory with the seconds spent in each stage and in total. With
+profiling on, a cProfile capture is written alongside as <name>.prof; it
+opens in snakeviz, or converts to a flamegraph with flameprof.
+
+Instrumentation is off by default. While off, document() and stage()
+return a shared no-op context manager, so an instrumented call costs a
+global lookup and a None check.
+"""
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+DEFAULT_REPORT_DIR = 'conversion-reports'
+
+_NULL = nullcontext()
+
+# (report directory, profile) while enabled, None while disabled
+_settings = None
+
+# Stage totals of the document being converted in this process
+_current_stages = None
+
+
+def configure(report_dir=None, profile=False):
+    """Enable instrumentation with reports written to report_dir; None disables it."""
+    global _settings
+    _settings = None if report_dir is None else (Path(report_dir), profile)
+
+
+def settings():
+    """Arguments for configure() that reproduce the current setup, e.g. in a worker process."""
+    return _settings or (None, False)
+
+
+def add_arguments(parser):
+    """Add the --report-dir and --profile options to an argparse parser."""
+    parser.add_argument('--report-dir', type=Path,
+                        help='write a JSON report of per-stage timings for each document to this directory')
+    parser.add_argument('--profile', action='store_true',
+                        help=f'also capture a cProfile .prof for each document '
+                             f'(reports go to ./{DEFAULT_REPORT_DIR} unless --report-dir is given)')
+
+
+def configure_from_args(args):
+    """Configure instrumentation from options added by add_arguments()."""
+    report_dir = args.report_dir
+    if args.profile and report_dir is None:
+        report_dir = Path(DEFAULT_REPORT_DIR)
+    configure(report_dir, args.profile)
+
+
+def document(name, **details):
+    """
+    Context manager recording one document's conversion under name.
+
+    details (source path etc.) are copied into the report. Nested calls
+    join the document already being recorded.
+    """
+    if _settings is None or _current_stages is not None:
+        return _NULL
+    return _record_document(name, details)
+
+
+def stage(name):
+    """Context manager adding the time spent inside it to the named stage."""
+    if _current_stages is None:
+        return _NULL
+    return _record_stage(_current_stages, name)
+
+
+@contextmanager
+def _record_document(name, details):
+    global _current_stages
+    report_dir, profile = _settings
+
+    report = {
+        'document': name,
+        **details,
+        'started': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'stages': {},
+    }
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    _current_stages = report['stages']
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    except BaseException as e:
+        report['error'] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+        report['total'] = time.perf_counter() - start
+        _current_stages = None
+
+        report_dir.mkdir(parents=True, exist_ok=True)
+        if profiler:
+            profile_path = report_dir / f'{name}.prof'
+            profiler.dump_stats(profile_path)
+            report['profile'] = str(profile_path)
+        with open(report_dir / f'{name}.json', 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+@contextmanager
+def _record_stage(stages, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages[name] = stages.get(name, 0.0) + time.perf_counter() - start
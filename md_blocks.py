@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Markdown Block Parser
+Parses governance markdown into a flat stream of blocks for the document renderers.
+
+Covers the markdown the drafts use, the constructs the old markdown ->
+HTML -> BeautifulSoup pipeline handled with the tables, fenced_code and
+toc extensions: ATX and setext headings, paragraphs, bullet, numbered and
+task lists, pipe tables, fenced and indented code, blockquotes and
+horizontal rules. Nested list items are flattened into their parent list.
+The output is not identical to that pipeline's: adjacent inline spans of
+the same style are merged and a few unclosed or empty delimiters are
+split differently, so the drafts give fewer formatted runs (5551 rather
+than 5565, see benchmarks/bench_inline.py).
+
+Block text keeps inline emphasis and code markers (*, **, ***, `) for the
+renderer to format; links, HTML entities and backslash escapes are
+resolved at parse time. Use strip_inline() where plain text is needed.
+"""
+
+import html
+import re
+from collections import namedtuple
+
+
+# Bump whenever the block stream produced for a given source changes
+PARSER_VERSION = '1'
+
+# Block kinds
+HEADING = 'heading'
+PARAGRAPH = 'paragraph'
+BULLET_LIST = 'bullet_list'
+ORDERED_LIST = 'ordered_list'
+TABLE = 'table'
+CODE = 'code'
+BLOCKQUOTE = 'blockquote'
+RULE = 'rule'
+
+# kind:  one of the block kinds above
+# text:  inline markdown for headings, paragraphs and blockquotes; raw text for code
+# level: heading level 1-6
+# items: list item texts (inline markdown)
+# rows:  table rows as lists of cell texts (inline markdown), header row first
+Block = namedtuple('Block', ['kind', 'text', 'level', 'items', 'rows'], defaults=('', 0, (), ()))
+
+
+_FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+_ATX_RE = re.compile(r'^(#{1,6})(.*?)#*\s*$')
+_SETEXT_RE = re.compile(r'^ {0,3}(=+|-+)\s*$')
+_RULE_RE = re.compile(r'^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$')
+_LIST_RE = re.compile(r'^([ \t]*)([-*+]|\d+[.)])[ \t]+(.*)$')
+_QUOTE_RE = re.compile(r'^ {0,3}> ?(.*)$')
+_TABLE_SEP_RE = re.compile(r'^[ \t]*\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)*\|?[ \t]*$')
+
+_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\([^)]*\)')
+_LINK_RE = re.compile(r'\[([^\]]+)\]\([^)]*\)')
+_AUTOLINK_RE = re.compile(r'<((?:https?|ftp|mailto):[^>\s]+)>')
+_ESCAPE_RE = re.compile(r'\\([\\`*_{}\[\]()#+\-.!|>])')
+
+# Inline span delimiters; a run of asterisks opens with the longest that has a closer
+_SPAN_OPENER_RE = re.compile(r'[*`]')
+_ASTERISK_DELIMITERS = ('***', '**', '*')
+_CODE_DELIMITERS = ('`',)
+_SPAN_STYLES = {'***': 'bold_italic', '**': 'bold', '*': 'italic', '`': 'code'}
+
+
+def parse(md_content):
+    """Parse a markdown string into a list of Blocks."""
+    return list(iter_blocks(md_content.splitlines()))
+
+
+def iter_blocks(lines):
+    """
+    Yield Blocks from an iterable of lines (with or without line endings).
+
+    Lines are consumed lazily, so an open file can be passed directly and
+    only the block being assembled is held in memory.
+    """
+    src = _LineReader(lines)
+
+    while True:
+        line = src.next()
+        if line is None:
+            return
+        if not line.strip():
+            continue
+
+        fence = _FENCE_RE.match(line)
+        if fence:
+            yield _read_fence(src, fence.group(1))
+            continue
+
+        heading = _ATX_RE.match(line)
+        if heading and heading.group(2).strip():
+            yield Block(HEADING, text=_inline(heading.group(2).strip()), level=len(heading.group(1)))
+            continue
+
+        if _RULE_RE.match(line):
+            yield Block(RULE)
+            continue
+
+        if line.startswith(('    ', '\t')):
+            yield _read_indented_code(src, line)
+            continue
+
+        item = _LIST_RE.match(line)
+        if item:
+            yield _read_list(src, item)
+            continue
+
+        if _QUOTE_RE.match(line):
+            yield _read_quote(src, line)
+            continue
+
+        if _is_table_start(line, src.peek()):
+            yield _read_table(src, line)
+            continue
+
+        block = _read_paragraph(src, line)
+        if block is not None:
+            yield block
+
+
+def inline_segments(text):
+    """
+    Split inline markdown into (text, style) segments in a single pass.
+
+    style is None, 'bold', 'italic', 'bold_italic' or 'code'. A span opens
+    at a run of up to three asterisks (longest first) or a backtick and
+    closes at the next identical delimiter on the same line; spans with no
+    closer, or empty content, stay literal. Adjacent segments with the same
+    style are merged, so callers emit as few runs as possible.
+
+    The scan is a single left-to-right pass. Each delimiter's next closer
+    is found once and remembered: a later opener reuses it while it still
+    lies ahead, and a search that reached the end of the line without
+    finding one is not repeated on that line. So every character is
+    examined a bounded number of times per delimiter, and time is linear
+    in the length of the text however the delimiters are arranged.
+    """
+    if '*' not in text and '`' not in text:
+        return [(text, None)] if text else []
+
+    # Segments as [text pieces, style], pieces joined once at the end
+    segments = []
+
+    # delimiter: (searched from, line end, index of its closer or -1)
+    closers = {}
+    find = text.find
+    search = _SPAN_OPENER_RE.search
+    length = len(text)
+    line_end = -1
+    plain_start = 0
+    position = 0
+
+    while True:
+        opener = search(text, position)
+        if opener is None:
+            break
+        start = opener.start()
+        if start >= line_end:
+            line_end = find('\n', start)
+            if line_end == -1:
+                line_end = length
+
+        if text[start] == '`':
+            candidates = _CODE_DELIMITERS
+        elif text.startswith('**', start):
+            candidates = _ASTERISK_DELIMITERS if text.startswith('***', start) else _ASTERISK_DELIMITERS[1:]
+        else:
+            candidates = _ASTERISK_DELIMITERS[2:]
+
+        for delimiter in candidates:
+            content_start = start + len(delimiter)
+            cached = closers.get(delimiter)
+            if cached is not None and cached[1] == line_end and cached[0] <= content_start and \
+                    (cached[2] == -1 or cached[2] >= content_start):
+                close = cached[2]
+            else:
+                close = find(delimiter, content_start, line_end)
+                closers[delimiter] = (content_start, line_end, close)
+            if close != -1:
+                break
+        else:
+            position = start + 1
+            continue
+
+        position = close + len(delimiter)
+        if close == content_start:
+            # An empty span is left in the plain text
+            continue
+        style = _SPAN_STYLES[delimiter]
+        if start > plain_start:
+            if segments and segments[-1][1] is None:
+                segments[-1][0].append(text[plain_start:start])
+            else:
+                segments.append([[text[plain_start:start]], None])
+        if segments and segments[-1][1] == style:
+            segments[-1][0].append(text[content_start:close])
+        else:
+            segments.append([[text[content_start:close]], style])
+        plain_start = position
+
+    if plain_start < length:
+        if segments and segments[-1][1] is None:
+            segments[-1][0].append(text[plain_start:])
+        else:
+            segments.append([[text[plain_start:]], None])
+
+    return [(''.join(parts), style) for parts, style in segments]
+
+
+def strip_inline(text):
+    """Return inline markdown text with emphasis and code markers removed."""
+    return ''.join(part for part, _ in inline_segments(text))
+
+
+class _LineReader:
+    """Line iterator with lookahead and push-back."""
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self._pending = []
+
+    def peek(self):
+        if not self._pending:
+            try:
+                self._pending.append(next(self._lines).rstrip('\r\n'))
+            except StopIteration:
+                return None
+        return self._pending[-1]
+
+    def next(self):
+        line = self.peek()
+        if line is not None:
+            self._pending.pop()
+        return line
+
+    def push(self, line):
+        self._pending.append(line)
+
+
+def _inline(text):
+    """Resolve links, entities and escapes, leaving emphasis and code markers."""
+    text = _IMAGE_RE.sub(r'\1', text)
+    text = _LINK_RE.sub(r'\1', text)
+    text = _AUTOLINK_RE.sub(r'\1', text)
+    text = _ESCAPE_RE.sub(r'\1', text)
+    return html.unescape(text)
+
+
+def _starts_block(line, next_line):
+    """True if line opens a block that interrupts a paragraph or list item."""
+    return bool(
+        _FENCE_RE.match(line)
+        or _ATX_RE.match(line)
+        or _RULE_RE.match(line)
+        or _QUOTE_RE.match(line)
+        or _is_table_start(line, next_line)
+    )
+
+
+def _read_fence(src, fence):
+    """Read a fenced code block; an unclosed fence runs to end of input."""
+    lines = []
+    while True:
+        line = src.next()
+        if line is None:
+            break
+        stripped = line.strip()
+        if stripped.startswith(fence[0] * len(fence)) and not stripped.strip(fence[0]):
+            break
+        lines.append(line)
+    return Block(CODE, text='\n'.join(lines))
+
+
+def _read_indented_code(src, first):
+    """Read a code block indented by four spaces or a tab."""
+    lines = [first]
+    while True:
+        line = src.peek()
+        if line is None:
+            break
+        if line.strip() and not line.startswith(('    ', '\t')):
+            break
+        lines.append(src.next())
+
+    while lines and not lines[-1].strip():
+        lines.pop()
+    text = '\n'.join(line[4:] if line.startswith('    ') else line[1:] for line in lines)
+    return Block(CODE, text=text)
+
+
+def _read_list(src, first):
+    """Read a bullet or numbered list, flattening nested items."""
+    ordered = first.group(2)[0].isdigit()
+    base_indent = len(first.group(1).expandtabs(4))
+    items = [first.group(3).strip()]
+
+    while True:
+        line = src.next()
+        if line is None:
+            break
+
+        if not line.strip():
+            # A blank line ends the list unless more items or an indented
+            # continuation follow
+            while src.peek() is not None and not src.peek().strip():
+                src.next()
+            following = src.peek()
+            if following is None:
+                break
+            item = _LIST_RE.match(following)
+            if item and not _RULE_RE.match(following):
+                if len(item.group(1).expandtabs(4)) > base_indent or item.group(2)[0].isdigit() == ordered:
+                    continue
+                break
+            if following.startswith((' ', '\t')) and not _FENCE_RE.match(following):
+                items[-1] += '\n' + following.strip()
+                src.next()
+                continue
+            break
+
+        item = _LIST_RE.match(line)
+        if item and not _RULE_RE.match(line):
+            if len(item.group(1).expandtabs(4)) <= base_indent and item.group(2)[0].isdigit() != ordered:
+                src.push(line)
+                break
+            items.append(item.group(3).strip())
+            continue
+
+        if _starts_block(line, src.peek()):
+            src.push(line)
+            break
+
+        # Continuation line of the current item
+        items[-1] += '\n' + line.strip()
+
+    kind = ORDERED_LIST if ordered else BULLET_LIST
+    return Block(kind, items=[_inline(text) for text in items])
+
+
+def _read_quote(src, first):
+    """Read a blockquote, including lazy continuation lines."""
+    lines = [_QUOTE_RE.match(first).group(1).strip()]
+    while True:
+        line = src.peek()
+        if line is None or not line.strip():
+            break
+        quoted = _QUOTE_RE.match(line)
+        if quoted:
+            lines.append(quoted.group(1).strip())
+        elif _starts_block(line, None) or _LIST_RE.match(line):
+            break
+        else:
+            lines.append(line.strip())
+        src.next()
+    return Block(BLOCKQUOTE, text=_inline('\n'.join(line for line in lines if line)))
+
+
+def _is_table_start(line, next_line):
+    """True if line is a table header row followed by a separator row."""
+    return (
+        next_line is not None
+        and '|' in line
+        and '|' in next_line
+        and _TABLE_SEP_RE.match(next_line) is not None
+    )
+
+
+def _split_row(line):
+    """Split a table row into cells, honouring escaped pipes and code spans."""
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|') and not line.endswith('\\|'):
+        line = line[:-1]
+
+    cells = []
+    current = []
+    in_code = False
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if char == '\\' and i + 1 < len(line) and line[i + 1] == '|':
+            current.append('|')
+            i += 2
+            continue
+        if char == '`':
+            in_code = not in_code
+        elif char == '|' and not in_code:
+            cells.append(''.join(current).strip())
+            current = []
+            i += 1
+            continue
+        current.append(char)
+        i += 1
+    cells.append(''.join(current).strip())
+    return cells
+
+
+def _read_table(src, header_line):
+    """Read a pipe table; body rows are padded or trimmed to the header width."""
+    header = _split_row(header_line)
+    src.next()  # separator row
+    width = len(header)
+    rows = [[_inline(cell) for cell in header]]
+
+    while True:
+        line = src.peek()
+        if line is None or not line.strip() or '|' not in line:
+            break
+        cells = _split_row(src.next())
+        cells = (cells + [''] * width)[:width]
+        rows.append([_inline(cell) for cell in cells])
+
+    return Block(TABLE, rows=rows)
+
+
+def _read_paragraph(src, first):
+    """Read a paragraph, which may turn out to be a setext heading."""
+    lines = [first.strip()]
+    while True:
+        line = src.peek()
+        if line is None or not line.strip():
+            break
+
+        setext = _SETEXT_RE.match(line)
+        if setext:
+            src.next()
+            level = 1 if setext.group(1)[0] == '=' else 2
+            return Block(HEADING, text=_inline('\n'.join(lines)), level=level)
+
+        src.next()
+        if _starts_block(line, src.peek()) or _LIST_RE.match(line):
+            src.push(line)
+            break
+        lines.append(line.strip())
+
+    text = '\n'.join(lines)
+    if text == '[TOC]':
+        # The toc extension's marker; the table of contents was never rendered
+        return None
+    return Block(PARAGRAPH, text=_inline(text))
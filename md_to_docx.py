@@ -1,242 +1,641 @@
 #!/usr/bin/env python3
 """
 Markdown to Word Document Converter
-Converts all markdown files in governance-docs folder to Word documents.
+Converts governance markdown files to Word documents.
 """
 
+import io
+import json
 import os
+import queue
+import sys
 import re
-import markdown
-from bs4 import BeautifulSoup
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from lxml import etree
 from docx import Document
-from docx.shared import Inches, Pt, RGBColor
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.section import Section
+from docx.shared import Emu, Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.style import WD_STYLE_TYPE
-from docx.enum.table import WD_TABLE_ALIGNMENT
 from pathlib import Path
 
+import instrumentation
+import md_blocks
+import ooxml_output
+import parse_cache
+from build_manifest import code_hash, hash_bytes, hash_settings
+from content_cache import ContentCache
+from docx_settings import CONVERTER_VERSION, HEADING_STYLES
+
 
 def setup_document_styles(doc):
     """Configure document styles for professional appearance."""
     styles = doc.styles
 
-    # Modify Heading 1
-    h1_style = styles['Heading 1']
-    h1_style.font.size = Pt(18)
-    h1_style.font.bold = True
-    h1_style.font.color.rgb = RGBColor(0, 51, 102)
-
-    # Modify Heading 2
-    h2_style = styles['Heading 2']
-    h2_style.font.size = Pt(16)
-    h2_style.font.bold = True
-    h2_style.font.color.rgb = RGBColor(0, 76, 153)
-
-    # Modify Heading 3
-    h3_style = styles['Heading 3']
-    h3_style.font.size = Pt(14)
-    h3_style.font.bold = True
-    h3_style.font.color.rgb = RGBColor(51, 102, 153)
-
-    # Modify Heading 4
-    h4_style = styles['Heading 4']
-    h4_style.font.size = Pt(12)
-    h4_style.font.bold = True
-    h4_style.font.color.rgb = RGBColor(51, 102, 153)
+    for style_name, (size, color) in HEADING_STYLES.items():
+        style = styles[style_name]
+        style.font.size = Pt(size)
+        style.font.bold = True
+        style.font.color.rgb = RGBColor(*color)
 
     return doc
 
 
-def process_inline_formatting(paragraph, text):
-    """Process inline markdown formatting (bold, italic, code)."""
-    # Pattern to match bold, italic, inline code
-    patterns = [
-        (r'\*\*\*(.+?)\*\*\*', 'bold_italic'),  # Bold italic
-        (r'\*\*(.+?)\*\*', 'bold'),              # Bold
-        (r'\*(.+?)\*', 'italic'),                # Italic
-        (r'`(.+?)`', 'code'),                    # Inline code
-    ]
+# Styles the renderer applies by name
+RENDERER_STYLES = ['Heading 1', 'Heading 2', 'Heading 3', 'Heading 4', 'List Bullet', 'List Number', 'Table Grid']
 
-    # Simple approach: just add text with basic formatting detection
-    # Split by formatting markers and process
-    parts = re.split(r'(\*\*\*.*?\*\*\*|\*\*.*?\*\*|\*.*?\*|`.*?`)', text)
+# Styled base documents by style configuration, as uncompressed .docx bytes
+_BASE_DOCUMENTS = {}
 
-    for part in parts:
-        if not part:
-            continue
-        if part.startswith('***') and part.endswith('***'):
-            run = paragraph.add_run(part[3:-3])
-            run.bold = True
-            run.italic = True
-        elif part.startswith('**') and part.endswith('**'):
-            run = paragraph.add_run(part[2:-2])
+# Style name -> style id in the base template
+_STYLE_IDS = {}
+
+# Rendered heading sections, as body XML keyed by section content
+FRAGMENT_CACHE_DIR = Path(__file__).resolve().parent / '.fragment-cache'
+FRAGMENT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Files a batch holds between its read, render and write stages
+PIPELINE_DEPTH = 4
+
+# Namespace declarations on a serialized body element
+_XMLNS_RE = re.compile(rb'\s+xmlns:\w+="[^"]*"')
+
+
+def new_document():
+    """
+    Return a new Document with the heading styles applied.
+
+    The default template is loaded and styled once per process and style
+    configuration, then cached as an uncompressed package; every later call
+    is a clone from those bytes.
+    """
+    return Document(io.BytesIO(_base_package()))
+
+
+def _base_package():
+    """The styled base document for the current HEADING_STYLES and SOURCE_DATE_EPOCH, as .docx bytes."""
+    key = (hash_settings(HEADING_STYLES), ooxml_output.source_date_epoch())
+    if key not in _BASE_DOCUMENTS:
+        doc = setup_document_styles(Document())
+        _STYLE_IDS.update((name, doc.styles[name].style_id) for name in RENDERER_STYLES)
+
+        # Stored uncompressed, so clones skip inflating it
+        _BASE_DOCUMENTS[key] = ooxml_output.save(doc, None, compression='stored')
+
+    return _BASE_DOCUMENTS[key]
+
+
+def add_styled_paragraph(doc, style_name):
+    """
+    Add an empty paragraph in a named paragraph style.
+
+    The style id is set directly: python-docx's paragraph style setter scans
+    every style in the document for the default style on each call, which
+    dominated conversion time for list-heavy drafts.
+    """
+    style_id = _STYLE_IDS.get(style_name) or doc.styles[style_name].style_id
+
+    p = doc.add_paragraph()
+    p._p.style = style_id
+    return p
+
+
+def process_inline_formatting(paragraph, text):
+    """Process inline markdown formatting (bold, italic, code)."""
+    for part, style in md_blocks.inline_segments(text):
+        run = paragraph.add_run(part)
+        if style in ('bold', 'bold_italic'):
             run.bold = True
-        elif part.startswith('*') and part.endswith('*') and len(part) > 2:
-            run = paragraph.add_run(part[1:-1])
+        if style in ('italic', 'bold_italic'):
             run.italic = True
-        elif part.startswith('`') and part.endswith('`'):
-            run = paragraph.add_run(part[1:-1])
+        if style == 'code':
             run.font.name = 'Consolas'
             run.font.size = Pt(10)
-        else:
-            paragraph.add_run(part)
 
 
-def add_table_from_html(doc, table_soup):
-    """Convert HTML table to Word table."""
-    rows = table_soup.find_all('tr')
+def _xml_escape(text):
+    """Escape &, < and > for XML character data."""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _run_xml(text, style, bold=False):
+    """WordprocessingML for a single run, matching what add_run() produces."""
+    props = []
+    if style == 'code':
+        props.append('<w:rFonts w:ascii="Consolas" w:hAnsi="Consolas"/>')
+    if bold or style in ('bold', 'bold_italic'):
+        props.append('<w:b/>')
+    if style in ('italic', 'bold_italic'):
+        props.append('<w:i/>')
+    if style == 'code':
+        props.append('<w:sz w:val="20"/>')
+    rpr = f'<w:rPr>{"".join(props)}</w:rPr>' if props else ''
+
+    pieces = []
+    for i, line in enumerate(text.split('\n')):
+        if i:
+            pieces.append('<w:br/>')
+        if line:
+            space = ' xml:space="preserve"' if line != line.strip() else ''
+            pieces.append(f'<w:t{space}>{_xml_escape(line)}</w:t>')
+    return f'<w:r>{rpr}{"".join(pieces)}</w:r>'
+
+
+def add_table(doc, rows):
+    """
+    Add a table from parsed rows (header row first) to the document.
+
+    The whole w:tbl element is generated as one XML string and parsed once,
+    rather than filled cell by cell through python-docx, whose row and cell
+    accessors re-walk the grid on every call.
+    """
     if not rows:
         return
 
     # Count columns from first row
-    first_row = rows[0]
-    cols = first_row.find_all(['th', 'td'])
-    num_cols = len(cols)
+    num_cols = len(rows[0])
 
     if num_cols == 0:
         return
 
-    # Create table
-    table = doc.add_table(rows=len(rows), cols=num_cols)
-    table.style = 'Table Grid'
-    table.alignment = WD_TABLE_ALIGNMENT.CENTER
-
+    # Spread the text width evenly across the columns, as add_table() does
+    # doc.sections would run an xpath over the whole body for every table
+    section = Section(doc.element.body.sectPr, doc.part)
+    block_width = section.page_width - section.left_margin - section.right_margin
+    col_width = Emu(block_width // num_cols).twips
+    style_id = _STYLE_IDS.get('Table Grid') or doc.styles['Table Grid'].style_id
+
+    cell_open = f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{col_width}"/></w:tcPr><w:p>'
+    xml = [
+        f'<w:tbl {nsdecls("w")}>',
+        f'<w:tblPr><w:tblStyle w:val="{style_id}"/><w:tblW w:type="auto" w:w="0"/>'
+        '<w:jc w:val="center"/><w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0"'
+        ' w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr>',
+        '<w:tblGrid>', f'<w:gridCol w:w="{col_width}"/>' * num_cols, '</w:tblGrid>',
+    ]
     for row_idx, row in enumerate(rows):
-        cells = row.find_all(['th', 'td'])
-        for col_idx, cell in enumerate(cells):
-            if col_idx < num_cols:
-                table_cell = table.rows[row_idx].cells[col_idx]
-                cell_text = cell.get_text().strip()
-                table_cell.text = cell_text
-
-                # Bold headers
-                if cell.name == 'th' or row_idx == 0:
-                    for paragraph in table_cell.paragraphs:
-                        for run in paragraph.runs:
-                            run.bold = True
+        # Bold headers
+        header = row_idx == 0
+        xml.append('<w:tr>')
+        for cell_text in row[:num_cols]:
+            xml.append(cell_open)
+            for part, style in md_blocks.inline_segments(cell_text.strip()):
+                xml.append(_run_xml(part, style, bold=header))
+            xml.append('</w:p></w:tc>')
+        # Short rows still need every grid cell
+        xml.append((cell_open + '</w:p></w:tc>') * (num_cols - len(row)))
+        xml.append('</w:tr>')
+    xml.append('</w:tbl>')
+
+    doc.element.body._insert_tbl(parse_xml(''.join(xml)))
 
     # Add spacing after table
     doc.add_paragraph()
 
 
-def convert_markdown_to_docx(md_content, output_path, title="Document"):
-    """Convert markdown content to a Word document."""
-    doc = Document()
-    setup_document_styles(doc)
+def render_block(doc, block):
+    """Append a parsed markdown block to the document."""
+    kind = block.kind
 
-    # Convert markdown to HTML first
-    html = markdown.markdown(
-        md_content,
-        extensions=['tables', 'fenced_code', 'toc']
-    )
-    soup = BeautifulSoup(html, 'html.parser')
-
-    # Process elements
-    for element in soup.children:
-        if element.name is None:
-            continue
-
-        if element.name == 'h1':
-            doc.add_heading(element.get_text(), level=1)
-        elif element.name == 'h2':
-            doc.add_heading(element.get_text(), level=2)
-        elif element.name == 'h3':
-            doc.add_heading(element.get_text(), level=3)
-        elif element.name == 'h4':
-            doc.add_heading(element.get_text(), level=4)
-        elif element.name == 'h5':
-            p = doc.add_paragraph()
-            run = p.add_run(element.get_text())
-            run.bold = True
-            run.font.size = Pt(11)
-        elif element.name == 'h6':
+    if kind == md_blocks.HEADING:
+        text = md_blocks.strip_inline(block.text)
+        if block.level <= 4:
+            add_styled_paragraph(doc, f'Heading {block.level}').add_run(text)
+        else:
             p = doc.add_paragraph()
-            run = p.add_run(element.get_text())
+            run = p.add_run(text)
             run.bold = True
-            run.font.size = Pt(10)
-        elif element.name == 'p':
-            p = doc.add_paragraph()
-            process_inline_formatting(p, element.get_text())
-        elif element.name == 'ul':
-            for li in element.find_all('li', recursive=False):
-                p = doc.add_paragraph(style='List Bullet')
-                # Check for checkbox
-                text = li.get_text()
-                if text.startswith('[ ]'):
-                    p.add_run('☐ ' + text[3:].strip())
-                elif text.startswith('[x]') or text.startswith('[X]'):
-                    p.add_run('☑ ' + text[3:].strip())
-                else:
-                    process_inline_formatting(p, text)
-        elif element.name == 'ol':
-            for li in element.find_all('li', recursive=False):
-                p = doc.add_paragraph(style='List Number')
-                process_inline_formatting(p, li.get_text())
-        elif element.name == 'table':
-            add_table_from_html(doc, element)
-        elif element.name == 'pre':
-            # Code block
-            code = element.find('code')
-            if code:
-                code_text = code.get_text()
+            run.font.size = Pt(11 if block.level == 5 else 10)
+    elif kind == md_blocks.PARAGRAPH:
+        p = doc.add_paragraph()
+        process_inline_formatting(p, block.text)
+    elif kind == md_blocks.BULLET_LIST:
+        for text in block.items:
+            p = add_styled_paragraph(doc, 'List Bullet')
+            # Check for checkbox
+            if text.startswith('[ ]'):
+                p.add_run('☐ ' + md_blocks.strip_inline(text[3:].strip()))
+            elif text.startswith('[x]') or text.startswith('[X]'):
+                p.add_run('☑ ' + md_blocks.strip_inline(text[3:].strip()))
             else:
-                code_text = element.get_text()
+                process_inline_formatting(p, text)
+    elif kind == md_blocks.ORDERED_LIST:
+        for text in block.items:
+            p = add_styled_paragraph(doc, 'List Number')
+            process_inline_formatting(p, text)
+    elif kind == md_blocks.TABLE:
+        add_table(doc, block.rows)
+    elif kind == md_blocks.CODE:
+        p = doc.add_paragraph()
+        run = p.add_run(block.text)
+        run.font.name = 'Consolas'
+        run.font.size = Pt(9)
+        p.paragraph_format.left_indent = Inches(0.5)
+    elif kind == md_blocks.BLOCKQUOTE:
+        p = doc.add_paragraph()
+        p.paragraph_format.left_indent = Inches(0.5)
+        run = p.add_run(md_blocks.strip_inline(block.text))
+        run.italic = True
+    elif kind == md_blocks.RULE:
+        # Add a horizontal line (approximation)
+        p = doc.add_paragraph()
+        p.add_run('─' * 50)
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+
+def convert_markdown_to_docx(md_content, output_path=None, title="Document", compression='default'):
+    """
+    Convert markdown content to a Word document.
+
+    output_path is a path, a binary file-like object, or None to return
+    the document as bytes; see ooxml_output for compression.
+    """
+    with instrumentation.document(ooxml_output.target_name(output_path, 'document.docx')):
+        with instrumentation.stage('parse'):
+            blocks = md_blocks.parse(md_content)
+
+        return convert_blocks_to_docx(blocks, output_path, compression)
+
+
+def convert_blocks_to_docx(blocks, output_path=None, compression='default'):
+    """
+    Render parsed markdown blocks to a Word document (see convert_markdown_to_docx).
+
+    Each heading section is rendered on its own and its body XML cached by
+    content, so after an edit only the changed sections are rendered again
+    and the rest are spliced in from the fragment cache.
+    """
+    cache = fragment_cache()
+    target = io.BytesIO() if output_path is None else output_path
+
+    with instrumentation.document(ooxml_output.target_name(output_path, 'document.docx')):
+        with instrumentation.stage('build'):
+            fragments = list(iter_section_fragments(blocks, cache))
+
+        # Save document
+        with instrumentation.stage('save'):
+            write_docx_package(target, fragments, compression)
+
+    cache.evict()
+    return target.getvalue() if output_path is None else output_path
+
+
+def fragment_cache():
+    """The cache of rendered section XML; FRAGMENT_CACHE_DIR overrides its location."""
+    directory = os.environ.get('FRAGMENT_CACHE_DIR') or FRAGMENT_CACHE_DIR
+    return ContentCache(directory, FRAGMENT_CACHE_MAX_BYTES, suffix='.xml')
+
+
+def clear_fragment_cache():
+    """Delete every cached section, so the next documents are rendered from scratch."""
+    fragment_cache().clear()
+
+
+def split_sections(blocks):
+    """Split blocks into sections starting at each heading; the first may have none."""
+    sections = []
+    for block in blocks:
+        if block.kind == md_blocks.HEADING or not sections:
+            sections.append([])
+        sections[-1].append(block)
+    return sections
+
+
+def section_key(section):
+    """Fragment cache key: the section's blocks, the converter version and the converter's code."""
+    return hash_bytes(json.dumps([CONVERTER_VERSION, code_hash('md_to_docx'), section],
+                                 ensure_ascii=False).encode('utf-8'))
+
+
+def iter_section_fragments(blocks, cache=None):
+    """
+    Yield the document body XML for each heading section of blocks.
+
+    Sections found in cache (a ContentCache) are reused as they are; the
+    rest are rendered into a scratch document and added to it.
+    """
+    scratch = None
+    for section in split_sections(blocks):
+        key = section_key(section)
+        fragment = cache.get(key) if cache is not None else None
+
+        if fragment is None:
+            if scratch is None:
+                scratch = new_document()
+            for block in section:
+                render_block(scratch, block)
+            fragment = _take_body_xml(scratch)
+            if cache is not None:
+                cache.put(key, fragment)
+
+        yield fragment
+
 
-            p = doc.add_paragraph()
-            run = p.add_run(code_text)
-            run.font.name = 'Consolas'
-            run.font.size = Pt(9)
-            p.paragraph_format.left_indent = Inches(0.5)
-        elif element.name == 'blockquote':
-            p = doc.add_paragraph()
-            p.paragraph_format.left_indent = Inches(0.5)
-            run = p.add_run(element.get_text())
-            run.italic = True
-        elif element.name == 'hr':
-            # Add a horizontal line (approximation)
-            p = doc.add_paragraph()
-            p.add_run('─' * 50)
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+def iter_body_fragments(blocks):
+    """
+    Render blocks one at a time, yielding the document body XML for each.
 
-    # Save document
-    doc.save(output_path)
-    return output_path
+    Each block is rendered into a scratch document and removed again once
+    serialized, so only one block's elements exist at any time.
+    """
+    scratch = new_document()
 
+    for block in blocks:
+        render_block(scratch, block)
+        yield _take_body_xml(scratch)
 
-def main():
-    """Main function to convert all governance docs."""
-    source_dir = Path('/Users/govind/AIEngineering/governance-docs')
-    output_dir = Path('/Users/govind/AIEngineering/governance-docs-word')
 
-    # Create output directory
-    output_dir.mkdir(exist_ok=True)
+def _take_body_xml(doc):
+    """Serialize and remove everything in the document body but its w:sectPr."""
+    body = doc.element.body
+    sect_pr = body.sectPr
 
-    # Get all markdown files
-    md_files = sorted(source_dir.glob('*.md'))
+    fragment = []
+    for child in list(body):
+        if child is sect_pr:
+            continue
+        xml = etree.tostring(child, encoding='UTF-8', xml_declaration=False)
+        # Namespaces are already declared on the w:document root
+        tag_end = xml.index(b'>')
+        fragment.append(_XMLNS_RE.sub(b'', xml[:tag_end]) + xml[tag_end:])
+        body.remove(child)
+
+    return b''.join(fragment)
+
+
+def write_docx_package(output, body_fragments, compression='default'):
+    """
+    Write a .docx from the base document and a stream of body XML fragments.
+
+    word/document.xml is written through a streaming zip entry, so the
+    fragments never have to be held in memory together. output is a path
+    or a binary file-like object.
+    """
+    with zipfile.ZipFile(io.BytesIO(_base_package())) as src, \
+            ooxml_output.open_zip(output, compression) as dst:
+        for info in src.infolist():
+            data = src.read(info.filename)
+            if info.filename != 'word/document.xml':
+                dst.writestr(info.filename, data)
+                continue
+
+            # Base body holds only w:sectPr; content goes in front of it
+            split_at = data.index(b'<w:sectPr')
+            with dst.open(info.filename, 'w') as stream:
+                stream.write(data[:split_at])
+                for fragment in body_fragments:
+                    stream.write(fragment)
+                stream.write(data[split_at:])
+
+
+def convert_markdown_file_streaming(md_file, output_path=None, compression='default'):
+    """
+    Convert a markdown file to a Word document with memory bounded by block size.
+
+    The source is read line by line and each block is rendered and written
+    to the package as soon as it is complete, so peak memory depends on the
+    largest single block rather than on the length of the file. output_path
+    is a path, a binary file-like object, or None to return the document as
+    bytes.
+    """
+    target = io.BytesIO() if output_path is None else output_path
+    name = ooxml_output.target_name(output_path, 'document.docx')
+
+    with instrumentation.document(name, source=str(md_file)), \
+            instrumentation.stage('stream'), \
+            open(md_file, 'r', encoding='utf-8') as f:
+        write_docx_package(target, iter_body_fragments(md_blocks.iter_blocks(f)), compression)
+    return target.getvalue() if output_path is None else output_path
+
+
+def convert_file(md_file, output_path=None, stream=False, compression='default'):
+    """
+    Convert a single markdown file on disk to a Word document.
+
+    output_path is a path, a binary file-like object, or None to return the
+    document as bytes.
+    """
+    if stream:
+        return convert_markdown_file_streaming(md_file, output_path, compression)
+
+    name = ooxml_output.target_name(output_path, 'document.docx')
+    with instrumentation.document(name, source=str(md_file)):
+        with instrumentation.stage('read'), open(md_file, 'rb') as f:
+            data = f.read()
+
+        # Parsed once per source change and shared with the other converters
+        with instrumentation.stage('parse'):
+            blocks = parse_cache.ParseCache().blocks(data)
+
+        return convert_blocks_to_docx(blocks, output_path, compression)
+
+
+def _convert_job(md_file, output_path, stream=False, compression='default'):
+    """Pool worker: convert one file and report failure as a message, not a raise."""
+    try:
+        convert_file(md_file, output_path, stream, compression)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def convert_batch(md_files, output_dir, jobs=1, stream=False, compression='default'):
+    """
+    Convert markdown files into output_dir, optionally across a process pool.
+
+    Each file is converted independently, so a failure only affects that file.
+    Sources are read, rendered and written in overlapping stages (see
+    _pipelined_batch). With stream=True each file is instead converted in
+    constant memory (see convert_markdown_file_streaming), and compression
+    is one of the ooxml_output levels. Returns a list of (md_file,
+    output_path, error) tuples in input order, error being None on success.
+    """
+    output_dir = Path(output_dir)
+    tasks = [(Path(md_file), output_dir / (Path(md_file).stem + '.docx')) for md_file in md_files]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(tasks) or 1))
+
+    if not stream:
+        return _pipelined_batch(tasks, jobs, compression)
+
+    results = []
+    if jobs == 1:
+        for md_file, output_path in tasks:
+            print(f"Converting: {md_file.name}")
+            error = _convert_job(md_file, output_path, stream, compression)
+            _report(output_path, error)
+            results.append((md_file, output_path, error))
+        return results
+
+    # Submit the largest sources first so a long file doesn't start last
+    # and hold up the end of the batch
+    by_size = sorted(tasks, key=lambda task: _source_size(task[0]), reverse=True)
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=instrumentation.configure,
+                             initargs=instrumentation.settings()) as pool:
+        futures = {task: pool.submit(_convert_job, *task, stream, compression) for task in by_size}
+        for md_file, output_path in tasks:
+            future = futures[(md_file, output_path)]
+            print(f"Converting: {md_file.name}")
+            try:
+                error = future.result()
+            except Exception as e:  # worker process died
+                error = f"{type(e).__name__}: {e}"
+            _report(output_path, error)
+            results.append((md_file, output_path, error))
+
+    return results
+
+
+def _pipelined_batch(tasks, jobs, compression):
+    """
+    Convert (md_file, output_path) tasks in three overlapping stages.
+
+    A reader thread loads sources, the calling thread (or a pool of jobs
+    processes) parses and renders each one to package bytes, and a writer
+    thread saves the packages - so reading the next source and writing the
+    last document, slow on network drives, happen while the CPU renders.
+    The stages are joined by queues of at most PIPELINE_DEPTH files and at
+    most PIPELINE_DEPTH renders per worker are in flight, so a stage that
+    falls behind holds up the others rather than letting memory grow.
+    Progress is printed in input order as files are written, and results
+    are in input order. A failure reading, rendering, writing or reporting
+    a file is that file's error; the stages always run to the end.
+    """
+    results_order = tasks
+    if jobs > 1:
+        # Largest sources first, as above
+        tasks = sorted(tasks, key=lambda task: _source_size(task[0]), reverse=True)
+
+    sources = queue.Queue(maxsize=PIPELINE_DEPTH)
+    packages = queue.Queue(maxsize=PIPELINE_DEPTH)
+    errors = {}
+
+    def read_sources():
+        try:
+            for md_file, output_path in tasks:
+                try:
+                    with open(md_file, 'rb') as f:
+                        data, error = f.read(), None
+                except Exception as e:
+                    data, error = None, f"{type(e).__name__}: {e}"
+                sources.put((md_file, output_path, data, error))
+        finally:
+            sources.put(None)
+
+    def write_outputs():
+        reported = 0  # progress is printed in input order
+        while True:
+            item = packages.get()
+            if item is None:
+                return
+            md_file, output_path, package, error = item
+            if error is None:
+                try:
+                    ooxml_output.write_package(package, output_path)
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+            errors[(md_file, output_path)] = error
+
+            while reported < len(results_order) and results_order[reported] in errors:
+                task = results_order[reported]
+                reported += 1
+                try:
+                    print(f"Converting: {task[0].name}")
+                    _report(task[1], errors[task])
+                except Exception as e:
+                    errors[task] = f"{type(e).__name__}: {e}"
+
+    # Daemon threads, so an interrupted batch doesn't wait on a full queue
+    reader = threading.Thread(target=read_sources, name='docx-reader', daemon=True)
+    writer = threading.Thread(target=write_outputs, name='docx-writer', daemon=True)
+    reader.start()
+    writer.start()
+
+    pool = None
+    if jobs > 1:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=instrumentation.configure,
+                                   initargs=instrumentation.settings())
+    in_flight = deque()
+    try:
+        while True:
+            item = sources.get()
+            if item is None:
+                break
+            md_file, output_path, data, error = item
+
+            if error is not None:
+                in_flight.append((md_file, output_path, None, error))
+            elif pool is None:
+                in_flight.append((md_file, output_path) + _render_job(md_file, output_path, data, compression))
+            else:
+                in_flight.append((md_file, output_path,
+                                  pool.submit(_render_job, md_file, output_path, data, compression), None))
 
-    print(f"Found {len(md_files)} markdown files to convert")
-    print("-" * 50)
+            while len(in_flight) > (jobs * PIPELINE_DEPTH if pool else 0):
+                packages.put(_rendered(in_flight.popleft()))
+        while in_flight:
+            packages.put(_rendered(in_flight.popleft()))
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
-    for md_file in md_files:
-        print(f"Converting: {md_file.name}")
+    packages.put(None)
+    writer.join()
 
-        # Read markdown content
-        with open(md_file, 'r', encoding='utf-8') as f:
-            md_content = f.read()
+    return [(md_file, output_path, errors[(md_file, output_path)]) for md_file, output_path in results_order]
 
-        # Generate output filename
-        output_name = md_file.stem + '.docx'
-        output_path = output_dir / output_name
 
+def _rendered(entry):
+    """Wait for an in-flight render; returns (md_file, output_path, package, error)."""
+    md_file, output_path, package, error = entry
+    if isinstance(package, Future):
         try:
-            convert_markdown_to_docx(md_content, str(output_path), md_file.stem)
-            print(f"  ✓ Created: {output_path.name}")
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
+            package, error = package.result()
+        except Exception as e:  # worker process died
+            package, error = None, f"{type(e).__name__}: {e}"
+    return md_file, output_path, package, error
+
+
+def _render_job(md_file, output_path, data, compression='default'):
+    """Pool worker: parse and render source bytes to package bytes; returns (package, error)."""
+    try:
+        with instrumentation.document(Path(output_path).name, source=str(md_file)):
+            # Parsed once per source change and shared with the other converters
+            with instrumentation.stage('parse'):
+                blocks = parse_cache.ParseCache().blocks(data)
+            return convert_blocks_to_docx(blocks, None, compression), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _source_size(md_file):
+    """Size of a source file in bytes, or 0 if it can't be read."""
+    try:
+        return md_file.stat().st_size
+    except OSError:
+        return 0
+
+
+def _report(output_path, error):
+    """Print the outcome of a single conversion."""
+    if error is None:
+        print(f"  ✓ Created: {output_path.name}")
+    else:
+        print(f"  ✗ Error: {error}")
+
+
+def main(argv=None):
+    """Convert the governance drafts to Word documents (the `govdocs docx` command)."""
+    import govdocs
 
-    print("-" * 50)
-    print(f"Conversion complete! Files saved to: {output_dir}")
+    argv = sys.argv[1:] if argv is None else list(argv)
+    return govdocs.main(['docx', *argv])
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+OOXML Output
+One save path for .docx, .xlsx and .pptx packages with a choice of compression and target.
+
+    data = ooxml_output.save(doc, None)                       # bytes in memory
+    ooxml_output.save(wb, stream)                             # any binary file-like object
+    ooxml_output.save(prs, 'deck.pptx', compression='max')    # atomic file write
+
+Compression is 'stored' (no compression: fastest, for draft builds),
+'default' (deflate level 6, what the libraries write) or 'max' (deflate
+level 9, smallest, for release). The package parts are serialized by
+python-docx, openpyxl or python-pptx as usual; only the zip container
+is written here, so the choice of compression applies directly rather
+than by recompressing a finished package.
+
+Writes to a path go to a temporary file in the same directory that is
+renamed over the target once complete, so a reader never sees a partly
+written document and a failed save leaves the previous file in place.
+If the new file is byte-for-byte identical to the existing one, the
+existing file is left untouched, mtime included, so sync tools only see
+outputs that really changed.
+
+Output is reproducible when SOURCE_DATE_EPOCH is set (the reproducible-
+builds convention; --reproducible sets it): every zip entry and the
+created/modified document properties get that timestamp instead of the
+current time. Entry order and all other content already depend only on
+the document, so identical sources give identical bytes.
+"""
+
+import filecmp
+import io
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+# Earliest timestamp a zip entry can hold: 1980-01-01 00:00:00 UTC
+ZIP_EPOCH = 315532800
+
+# name: (zipfile compression method, compresslevel)
+# zipfile itself is imported on first use, so command lines can offer
+# --compression without paying for the import.
+COMPRESSION = {
+    'stored': ('ZIP_STORED', None),
+    'default': ('ZIP_DEFLATED', 6),
+    'max': ('ZIP_DEFLATED', 9),
+}
+
+
+def add_arguments(parser):
+    """Add the --compression and --reproducible options to an argparse parser."""
+    parser.add_argument('--compression', choices=list(COMPRESSION), default='default',
+                        help="zip compression of the output: 'stored' for fast drafts, "
+                             "'max' for the smallest files (default: default)")
+    parser.add_argument('--reproducible', action='store_true',
+                        help='write byte-identical output for identical sources, timestamped '
+                             'SOURCE_DATE_EPOCH (default: 1980-01-01)')
+
+
+def configure_from_args(args):
+    """Apply options added by add_arguments() that hold for the whole process."""
+    if args.reproducible and not os.environ.get('SOURCE_DATE_EPOCH'):
+        # Set in the environment so worker processes inherit it
+        os.environ['SOURCE_DATE_EPOCH'] = str(ZIP_EPOCH)
+
+
+def source_date_epoch():
+    """The fixed timestamp for reproducible output, or None for the current time."""
+    value = os.environ.get('SOURCE_DATE_EPOCH')
+    if not value:
+        return None
+    return max(int(value), ZIP_EPOCH)
+
+
+@contextmanager
+def open_zip(target, compression='default'):
+    """
+    Open a ZipFile for writing a package to target.
+
+    target is a path, written atomically, or a binary file-like object.
+    """
+    if hasattr(target, 'write'):
+        with _new_zipfile(target, compression) as zf:
+            yield zf
+        return
+
+    with _replacing(target) as tmp_path:
+        with _new_zipfile(tmp_path, compression) as zf:
+            yield zf
+
+
+def is_path(target):
+    """True if a save target is a file path, rather than a file-like object or None."""
+    return isinstance(target, (str, os.PathLike))
+
+
+def target_name(target, default):
+    """File name of a save target, for reports; default for file-like objects and None."""
+    return Path(target).name if is_path(target) else default
+
+
+def write_package(data, target):
+    """Write a package already serialized to bytes to a path, atomically like open_zip."""
+    with _replacing(target) as tmp_path:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+
+
+@contextmanager
+def _replacing(target):
+    """Yield a temporary path to write, then move it over target unless identical."""
+    target = Path(target)
+    tmp_path = target.with_name(f'.{target.name}.{os.getpid()}.tmp')
+    try:
+        yield tmp_path
+        if target.is_file() and filecmp.cmp(tmp_path, target, shallow=False):
+            tmp_path.unlink()
+        else:
+            os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def save(document, target, compression='default'):
+    """
+    Save a python-docx Document, openpyxl Workbook or python-pptx Presentation.
+
+    target is a path, a binary file-like object, or None to return the
+    package as bytes.
+    """
+    if target is None:
+        buffer = io.BytesIO()
+        save(document, buffer, compression)
+        return buffer.getvalue()
+
+    library = type(document).__module__.split('.')[0]
+    writers = {'docx': _write_docx, 'openpyxl': _write_xlsx, 'pptx': _write_pptx}
+    if library not in writers:
+        raise TypeError(f"Don't know how to save a {type(document).__name__}")
+
+    epoch = source_date_epoch()
+    if epoch is not None:
+        _set_dates(document, library, datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None))
+
+    with open_zip(target, compression) as zf:
+        writers[library](document, zf)
+    return target
+
+
+def _set_dates(document, library, timestamp):
+    """Set a document's created and modified properties."""
+    props = document.properties if library == 'openpyxl' else document.core_properties
+    props.created = timestamp
+    props.modified = timestamp
+
+
+def _new_zipfile(file, compression):
+    import zipfile
+
+    method, level = COMPRESSION[compression]
+    method = getattr(zipfile, method)
+
+    epoch = source_date_epoch()
+    if epoch is None:
+        return zipfile.ZipFile(file, 'w', method, compresslevel=level, allowZip64=True)
+
+    zf = _fixed_time_zipfile_class()(file, 'w', method, compresslevel=level, allowZip64=True)
+    zf.date_time = datetime.fromtimestamp(epoch, timezone.utc).timetuple()[:6]
+    return zf
+
+
+_FIXED_TIME_ZIPFILE = None
+
+
+def _fixed_time_zipfile_class():
+    """A ZipFile that stamps every entry written by name with its date_time attribute."""
+    global _FIXED_TIME_ZIPFILE
+    if _FIXED_TIME_ZIPFILE is not None:
+        return _FIXED_TIME_ZIPFILE
+
+    import shutil
+    import zipfile
+
+    class FixedTimeZipFile(zipfile.ZipFile):
+        date_time = (1980, 1, 1, 0, 0, 0)
+
+        def _entry(self, name):
+            zinfo = zipfile.ZipInfo(name, self.date_time)
+            zinfo.compress_type = self.compression
+            zinfo._compresslevel = self.compresslevel
+            zinfo.external_attr = 0o600 << 16
+            return zinfo
+
+        def writestr(self, zinfo_or_arcname, data, *args, **kwargs):
+            if not isinstance(zinfo_or_arcname, zipfile.ZipInfo):
+                zinfo_or_arcname = self._entry(zinfo_or_arcname)
+            super().writestr(zinfo_or_arcname, data, *args, **kwargs)
+
+        def write(self, filename, arcname=None, *args, **kwargs):
+            entry = self._entry(arcname or os.path.basename(filename))
+            with open(filename, 'rb') as src, self.open(entry, 'w') as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+
+        def open(self, name, mode='r', *args, **kwargs):
+            if mode == 'w' and not isinstance(name, zipfile.ZipInfo):
+                name = self._entry(name)
+            return super().open(name, mode, *args, **kwargs)
+
+    _FIXED_TIME_ZIPFILE = FixedTimeZipFile
+    return _FIXED_TIME_ZIPFILE
+
+
+class _PartWriter:
+    """The physical-writer interface python-docx and python-pptx serialize parts to."""
+
+    def __init__(self, zf):
+        self.zf = zf
+
+    def write(self, pack_uri, blob):
+        self.zf.writestr(pack_uri.membername, blob)
+
+
+def _write_docx(doc, zf):
+    # Mirrors docx.opc.package.OpcPackage.save
+    from docx.opc.pkgwriter import PackageWriter
+
+    package = doc.part.package
+    parts = list(package.parts)
+    for part in parts:
+        part.before_marshal()
+
+    writer = _PartWriter(zf)
+    PackageWriter._write_content_types_stream(writer, parts)
+    PackageWriter._write_pkg_rels(writer, package.rels)
+    PackageWriter._write_parts(writer, parts)
+
+
+def _write_pptx(prs, zf):
+    # Mirrors pptx.opc.package.OpcPackage.save
+    from pptx.opc.serialized import PackageWriter
+
+    package = prs.part.package
+    package_writer = PackageWriter(None, package._rels, tuple(package.iter_parts()))
+
+    writer = _PartWriter(zf)
+    package_writer._write_content_types_stream(writer)
+    package_writer._write_pkg_rels(writer)
+    package_writer._write_parts(writer)
+
+
+def _write_xlsx(wb, zf):
+    # Mirrors openpyxl's Workbook.save and save_workbook
+    from openpyxl.writer.excel import ExcelWriter
+
+    if wb.read_only:
+        raise TypeError("Workbook is read-only")
+    if wb.write_only and not wb.worksheets:
+        wb.create_sheet()
+
+    if source_date_epoch() is None:
+        wb.properties.modified = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+    ExcelWriter(wb, zf).write_data()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Parse Cache
+Content-addressed on-disk cache of parsed markdown, shared by every renderer.
+
+A source is parsed by md_blocks once per change: the resulting blocks are
+stored as JSON under the SHA-256 of the source bytes and the parser
+version, and every later load - by the Word converter, the RACI workbook
+or any other output - reads them back instead of re-parsing. Entries are
+immutable, so concurrent readers and writers (pool workers, the watcher)
+can share a cache directory safely.
+
+The cache is bounded in size; when a store pushes it over the limit, the
+least recently used entries are evicted. The directory defaults to
+.parse-cache in the repository and can be moved with the PARSE_CACHE_DIR
+environment variable.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import md_blocks
+from build_manifest import hash_bytes
+from content_cache import ContentCache
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / '.parse-cache'
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ParseCache(ContentCache):
+    """Parsed block lists stored by source hash, with LRU eviction by total size."""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        if directory is None:
+            directory = os.environ.get('PARSE_CACHE_DIR') or DEFAULT_CACHE_DIR
+        super().__init__(directory, max_bytes, suffix='.json')
+
+    def blocks(self, data):
+        """Return the Blocks for markdown source bytes, parsing only on a cache miss."""
+        key = f'{hash_bytes(data)}-v{md_blocks.PARSER_VERSION}'
+
+        blocks = self._decode(self.get(key))
+        if blocks is None:
+            blocks = md_blocks.parse(data.decode('utf-8'))
+            self.put(key, json.dumps(blocks, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            self.evict()
+        return blocks
+
+    def load_blocks(self, source_path):
+        """Return the Blocks for a markdown file, parsing only on a cache miss."""
+        with open(source_path, 'rb') as f:
+            return self.blocks(f.read())
+
+    def _decode(self, data):
+        if data is None:
+            return None
+        try:
+            fields = json.loads(data)
+        except ValueError:
+            return None
+        return [
+            md_blocks.Block(kind, text, level, items or (), rows or ())
+            for kind, text, level, items, rows in fields
+        ]
+
+
+def load_blocks(source_path):
+    """Return the Blocks for a markdown file through the default cache."""
+    return ParseCache().load_blocks(source_path)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Multi-Target Build Pipeline
+Builds every output of a source from a single parse.
+
+A build is a list of Targets: a renderer, the source it reads and the file
+it writes. Targets are grouped by source, each source with stale outputs is
+parsed once through the shared parse cache, and the parsed blocks are
+handed to every renderer of that source - RACI-Matrix.md to .docx and
+.xlsx, the CoE charter to .docx and its presentations. With a process pool
+the renderers of a source run side by side, and the parent parses the next
+source while the workers render.
+
+Outputs whose source and renderer are unchanged since they were last built
+are skipped using the build manifest, so a release build with nothing
+changed does no parse work at all.
+"""
+
+import os
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import instrumentation
+import parse_cache
+from build_manifest import BuildManifest, code_hash
+from docx_settings import build_fingerprint
+from ooxml_output import source_date_epoch
+
+
+# renderer: name of a RENDERERS entry
+# source:   markdown source Path
+# output:   output file Path
+Target = namedtuple('Target', ['renderer', 'source', 'output'])
+
+
+def render_docx(blocks, source, output_path, compression):
+    import md_to_docx
+    md_to_docx.convert_blocks_to_docx(blocks, str(output_path), compression)
+
+
+def render_raci_xlsx(blocks, source, output_path, compression):
+    from raci_to_excel import RACIExcelConverter
+    RACIExcelConverter(source, output_path, compression).convert(blocks)
+
+
+def render_charter_pptx(blocks, source, output_path, compression):
+    from coe_charter_to_pptx import CoEPresentationGenerator
+    CoEPresentationGenerator(output_path, compression).generate()
+
+
+def render_exec_pptx(blocks, source, output_path, compression):
+    from coe_exec_summary_pptx import ExecPresentationGenerator
+    ExecPresentationGenerator(output_path, compression).generate()
+
+
+# name: (render function, whether it reads the parsed source, module holding its code)
+# The slide decks carry their content in code, so they rebuild when their
+# module changes rather than when the source does.
+RENDERERS = {
+    'docx': (render_docx, True, 'md_to_docx'),
+    'raci-xlsx': (render_raci_xlsx, True, 'raci_to_excel'),
+    'charter-pptx': (render_charter_pptx, False, 'coe_charter_to_pptx'),
+    'exec-pptx': (render_exec_pptx, False, 'coe_exec_summary_pptx'),
+}
+
+def target_fingerprint(target, manifest, compression='default'):
+    """Everything a target's output depends on, for the build manifest."""
+    _, uses_blocks, module = RENDERERS[target.renderer]
+    source_hash = manifest.source_hash(target.source, target.output) if uses_blocks else None
+
+    if target.renderer == 'docx':
+        # Shared with `govdocs docx`, so either command sees the other's outputs
+        return build_fingerprint(source_hash, compression)
+    return {
+        'renderer': target.renderer,
+        'source_sha256': source_hash,
+        'code_sha256': code_hash(module),
+        'compression': compression,
+        'source_date_epoch': source_date_epoch(),
+    }
+
+
+def _render_job(renderer, blocks, source, output_path, compression):
+    """Pool worker: run one renderer and report failure as a message, not a raise."""
+    try:
+        RENDERERS[renderer][0](blocks, source, output_path, compression)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def _load_blocks(source):
+    """Parse a source through the cache; returns (blocks, error)."""
+    try:
+        return parse_cache.load_blocks(source), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def build(targets, jobs=1, force=False, compression='default'):
+    """
+    Build targets, parsing each source at most once.
+
+    Up-to-date targets are skipped unless force is set, which also clears
+    the docx fragment cache. jobs is the number of worker processes (0 =
+    one per CPU core), and compression one of the ooxml_output levels.
+    Failures affect only their own target. Returns a list of (target,
+    error) tuples for the targets that were built, in input order, error
+    being None on success.
+    """
+    manifests = {}
+    fingerprints = {}
+    by_source = OrderedDict()
+    for target in targets:
+        output_dir = target.output.parent
+        if output_dir not in manifests:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            manifests[output_dir] = BuildManifest.for_directory(output_dir)
+        manifest = manifests[output_dir]
+
+        fingerprint = target_fingerprint(target, manifest, compression)
+        if not force and manifest.is_up_to_date(target.output, fingerprint):
+            continue
+        fingerprints[target] = fingerprint
+        by_source.setdefault(target.source, []).append(target)
+
+    stale = [target for target in targets if target in fingerprints]
+    if force and any(target.renderer == 'docx' for target in stale):
+        # A forced rebuild renders every section again, not just every document
+        import md_to_docx
+        md_to_docx.clear_fragment_cache()
+    parsed = 0
+    errors = {}
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(stale) or 1))
+    pool = None
+    if jobs > 1:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=instrumentation.configure,
+                                   initargs=instrumentation.settings())
+    futures = {}
+
+    try:
+        for source, source_targets in by_source.items():
+            blocks = None
+            if any(RENDERERS[target.renderer][1] for target in source_targets):
+                blocks, error = _load_blocks(source)
+                parsed += 1
+                if error is not None:
+                    for target in source_targets:
+                        errors[target] = error
+                        if pool is None:
+                            _report(target, error)
+                    continue
+
+            for target in source_targets:
+                if pool is None:
+                    print(f"Building: {target.output.name}")
+                    errors[target] = _render_job(target.renderer, blocks, source, target.output, compression)
+                    _report(target, errors[target])
+                else:
+                    futures[target] = pool.submit(_render_job, target.renderer, blocks, source,
+                                                  target.output, compression)
+
+        for target in stale:
+            if target in futures:
+                print(f"Building: {target.output.name}")
+                try:
+                    errors[target] = futures[target].result()
+                except Exception as e:  # worker process died
+                    errors[target] = f"{type(e).__name__}: {e}"
+                _report(target, errors[target])
+            elif pool is not None:
+                # Its source failed to parse
+                _report(target, errors[target])
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    for target in stale:
+        manifest = manifests[target.output.parent]
+        if errors[target] is None:
+            manifest.record(target.output, fingerprints[target], target.source)
+        else:
+            manifest.forget(target.output)
+    for manifest in manifests.values():
+        manifest.save()
+
+    print(f"Parsed {parsed} sources for {len(stale)} outputs "
+          f"({len(targets) - len(stale)} up to date)")
+    return [(target, errors[target]) for target in stale]
+
+
+def _report(target, error):
+    """Print the outcome of a single target."""
+    if error is None:
+        print(f"  ✓ Created: {target.output.name}")
+    else:
+        print(f"  ✗ Error: {error}")
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+RACI Model
+Who is Responsible, Accountable, Consulted and Informed for each activity, as arrays.
+
+    model = raci_model.load('RACI-Matrix.md')
+    model.activities_where('DS', 'A')     # (section, activity) pairs DS is accountable for
+    model.role_load('R')                  # sections x roles: activities each role is responsible for
+
+Every activity row of every RACI table becomes one row of a uint8 matrix
+of activities x roles. Each cell holds the assignment as bits (R, A, C, I,
+plus the number of footnote asterisks in FOOTNOTES), so 'R/A' is R | A,
+'A**' is A | 2 * FOOTNOTE and a role not in the activity's table is 0.
+Activities carry the index of their section, subsection and table, and
+each table keeps the footnotes printed under it. Queries are whole-column
+NumPy operations, fast enough for merged matrices of tens of thousands of
+activities.
+
+A table is a RACI table when its first column is 'Activity'. Its other
+columns are roles if every cell in them is a RACI code; columns of prose,
+such as the tier comparison in section 18, are left out.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+import md_blocks
+
+
+# Assignment bits
+R = 1
+A = 2
+C = 4
+I = 8  # noqa: E741
+FOOTNOTE = 16  # one footnote mark, e.g. 'C*'
+FOOTNOTES = 48  # the number of footnote marks (0-3), in multiples of FOOTNOTE
+
+CODE_BITS = {'R': R, 'A': A, 'C': C, 'I': I}
+
+# Abbreviation: (full role, description), in the order the workbook lists them
+ROLE_ABBREVIATIONS = {
+    'BizSpon': ('Business Sponsor', 'Senior business leader sponsoring the initiative'),
+    'BizOwn': ('Business Owner', 'Day-to-day business point of contact'),
+    'DigProdHead': ('Head of Digital Products', 'Backlog management, requirements, UAT coordination'),
+    'AILead': ('AI Engineering Lead', 'Head of AI Engineering team'),
+    'BA': ('Business Analyst', 'Analyzes requirements, documents processes'),
+    'DS': ('Data Scientist', 'Develops AI/ML models'),
+    'MLE': ('ML Engineer', 'Implements ML pipelines, handles MLOps'),
+    'AutoDev': ('Automation Developer', 'Develops RPA bots, automation solutions'),
+    'SolArch': ('Solution Architect', 'Defines solution architecture'),
+    'DataEng': ('Data Engineer', 'Builds data pipelines'),
+    'ModelVal': ('Model Validator', 'Performs independent validation'),
+    'QA': ('Quality Assurance', 'Tests and validates solutions'),
+    'ItOps': ('IT Operations', 'Manages production infrastructure'),
+    'ItSec': ('IT Security', 'Reviews security requirements'),
+    'ItInfra': ('IT Infrastructure', 'Manages infrastructure'),
+    'Comply': ('Compliance', 'Ensures regulatory compliance'),
+    'Risk': ('Risk Management', 'Assesses and manages risks'),
+    'EntArch': ('Enterprise Architecture', 'Oversees enterprise architecture'),
+    'DataGov': ('Data Governance', 'Manages data governance'),
+    'SteerCom': ('Steering Committee', 'Senior governance body for Tier 1 initiatives'),
+}
+
+_CODE_RE = re.compile(r'^([RACI])(?:\s*/\s*([RACI]))?(\**)$')
+
+# A footnote line under a table, e.g. '**AILead accountable for Tier 2/3'
+# (but not a bold paragraph such as '**Distribution**')
+_FOOTNOTE_RE = re.compile(r'^(\*{1,3})([^*].*[^*])$')
+
+
+@lru_cache(maxsize=1024)
+def parse_code(text):
+    """
+    Return the assignment bits for a RACI cell, or None if it isn't a RACI code.
+
+    An empty cell is 0. Codes are R, A, C or I, two joined by a slash
+    ('R/A'), optionally followed by up to three footnote asterisks; case is
+    ignored.
+    """
+    text = text.strip().upper()
+    if not text:
+        return 0
+    match = _CODE_RE.match(text)
+    if match is None:
+        # Possibly emphasized, e.g. '**R**'
+        match = _CODE_RE.match(md_blocks.strip_inline(text).strip())
+        if match is None:
+            return None
+
+    first, second, stars = match.groups()
+    bits = CODE_BITS[first] | (CODE_BITS[second] if second else 0)
+    return bits | FOOTNOTE * min(len(stars), 3)
+
+
+def format_code(bits):
+    """The RACI code for assignment bits, e.g. 'R/A'; '' for no assignment."""
+    letters = '/'.join(letter for letter, bit in CODE_BITS.items() if bits & bit)
+    return letters + '*' * ((bits & FOOTNOTES) // FOOTNOTE)
+
+
+class RACIModel:
+    """
+    RACI assignments of activities x roles.
+
+    activities:     activity names, one per row
+    roles:          role abbreviations, one per column
+    codes:          uint8 array (activities x roles) of assignment bits
+    sections:       section titles; section_ids gives each activity's index
+    subsections:    subsection titles ('' for none); subsection_ids likewise
+    table_ids:      index of each activity's table
+    footnotes:      per table, {asterisk count: footnote text}, e.g.
+                    {1: 'For Tier 1 initiatives'}
+    rejected_columns: (section, subsection, header, value) for each column of
+                    a RACI table left out for holding a value that isn't a code
+    """
+
+    def __init__(self, activities, roles, codes, sections, section_ids, subsections, subsection_ids,
+                 rejected_columns=(), table_ids=None, footnotes=()):
+        self.activities = list(activities)
+        self.roles = list(roles)
+        self.codes = np.asarray(codes, dtype=np.uint8).reshape(len(self.activities), len(self.roles))
+        self.sections = list(sections)
+        self.section_ids = np.asarray(section_ids, dtype=np.int32)
+        self.subsections = list(subsections)
+        self.subsection_ids = np.asarray(subsection_ids, dtype=np.int32)
+        self.rejected_columns = list(rejected_columns)
+        self.table_ids = np.asarray([0] * len(self.activities) if table_ids is None else table_ids,
+                                    dtype=np.int32)
+        self.footnotes = [dict(notes) for notes in footnotes]
+        self._role_index = {role: index for index, role in enumerate(self.roles)}
+        self._section_index = {section: index for index, section in enumerate(self.sections)}
+
+    def __len__(self):
+        return len(self.activities)
+
+    @classmethod
+    def from_blocks(cls, blocks):
+        """Build the model from the RACI tables in parsed markdown blocks."""
+        roles = list(ROLE_ABBREVIATIONS)
+        role_index = {role: index for index, role in enumerate(roles)}
+        activities = []
+        tables = []  # (first activity row, role columns, assignment bits) per table
+        rejected_columns = []
+        sections = []
+        section_ids = []
+        subsections = ['']
+        subsection_ids = []
+        table_ids = []
+        footnotes = []
+        section = None
+        subsection = 0
+        last_table = None  # the table footnote paragraphs would belong to
+
+        for block in blocks:
+            if block.kind == md_blocks.PARAGRAPH and last_table is not None:
+                for line in block.text.splitlines():
+                    match = _FOOTNOTE_RE.match(line.strip())
+                    if match:
+                        footnotes[last_table][len(match.group(1))] = match.group(2).strip()
+                continue
+            last_table = None
+
+            if block.kind == md_blocks.HEADING and block.level == 2:
+                sections.append(block.text)
+                section = len(sections) - 1
+                subsection = 0
+            elif block.kind == md_blocks.HEADING and block.level == 3 and section is not None:
+                subsections.append(block.text)
+                subsection = len(subsections) - 1
+            elif block.kind == md_blocks.TABLE and section is not None:
+                table = _raci_table(block.rows)
+                if table is None:
+                    continue
+                table_roles, table_activities, bits, rejected = table
+                for header, value in rejected:
+                    rejected_columns.append((sections[section], subsections[subsection], header, value))
+                for role in table_roles:
+                    if role not in role_index:
+                        role_index[role] = len(roles)
+                        roles.append(role)
+                tables.append((len(activities), [role_index[role] for role in table_roles], bits))
+                activities.extend(table_activities)
+                section_ids.extend([section] * len(table_activities))
+                subsection_ids.extend([subsection] * len(table_activities))
+                table_ids.extend([len(footnotes)] * len(table_activities))
+                last_table = len(footnotes)
+                footnotes.append({})
+
+        codes = np.zeros((len(activities), len(roles)), dtype=np.uint8)
+        for start, columns, bits in tables:
+            codes[start:start + len(bits), columns] = bits
+        return cls(activities, roles, codes, sections, section_ids, subsections, subsection_ids,
+                   rejected_columns, table_ids, footnotes)
+
+    @classmethod
+    def merge(cls, models):
+        """One model of every activity in models, with their roles and sections combined."""
+        roles = []
+        for model in models:
+            roles.extend(role for role in model.roles if role not in roles)
+        role_index = {role: index for index, role in enumerate(roles)}
+
+        sections = []
+        subsections = []
+        codes = []
+        section_ids = []
+        subsection_ids = []
+        table_ids = []
+        footnotes = []
+        for model in models:
+            block = np.zeros((len(model), len(roles)), dtype=np.uint8)
+            block[:, [role_index[role] for role in model.roles]] = model.codes
+            codes.append(block)
+            section_ids.append(model.section_ids + len(sections))
+            subsection_ids.append(model.subsection_ids + len(subsections))
+            table_ids.append(model.table_ids + len(footnotes))
+            sections.extend(model.sections)
+            subsections.extend(model.subsections)
+            footnotes.extend(model.footnotes)
+
+        activities = [activity for model in models for activity in model.activities]
+        return cls(activities, roles,
+                   np.concatenate(codes) if codes else np.zeros((0, len(roles)), dtype=np.uint8),
+                   sections, np.concatenate(section_ids) if section_ids else [],
+                   subsections, np.concatenate(subsection_ids) if subsection_ids else [],
+                   [column for model in models for column in model.rejected_columns],
+                   np.concatenate(table_ids) if table_ids else [], footnotes)
+
+    def role(self, role):
+        """Column index of a role abbreviation."""
+        try:
+            return self._role_index[role]
+        except KeyError:
+            raise KeyError(f"Unknown role '{role}' (roles: {', '.join(self.roles)})") from None
+
+    def section(self, section):
+        """Index of a section title."""
+        try:
+            return self._section_index[section]
+        except KeyError:
+            raise KeyError(f"Unknown section '{section}'") from None
+
+    def where(self, role, code):
+        """Boolean mask of activities where role has every letter of code ('A', 'R/A', ...)."""
+        bits = _code_bits(code)
+        return (self.codes[:, self.role(role)] & bits) == bits
+
+    def activities_where(self, role, code):
+        """(section, activity) for each activity where role has code."""
+        return [(self.sections[self.section_ids[row]], self.activities[row])
+                for row in np.flatnonzero(self.where(role, code))]
+
+    def role_load(self, code=None):
+        """
+        Activities per section and role, as an int array (sections x roles).
+
+        Counts the activities where the role has code, or any assignment if
+        code is None.
+        """
+        if code is None:
+            assigned = (self.codes & (R | A | C | I)) != 0
+        else:
+            bits = _code_bits(code)
+            assigned = (self.codes & bits) == bits
+
+        cells = self.section_ids[:, None] * len(self.roles) + np.arange(len(self.roles))
+        counts = np.bincount(cells[assigned], minlength=len(self.sections) * len(self.roles))
+        return counts.reshape(len(self.sections), len(self.roles))
+
+    def assignment_counts(self, code):
+        """Number of roles with code, for each activity."""
+        bits = _code_bits(code)
+        return np.count_nonzero((self.codes & bits) == bits, axis=1)
+
+    def code(self, row, role):
+        """The RACI code of an activity row for a role, e.g. 'R/A'."""
+        return format_code(int(self.codes[row, self.role(role)]))
+
+
+def _code_bits(code):
+    bits = parse_code(code)
+    if not bits:
+        raise ValueError(f"Not a RACI code: '{code}'")
+    return bits & ~FOOTNOTES
+
+
+def _raci_table(rows):
+    """
+    (roles, activities, assignment bits array, rejected columns) for a RACI
+    table, or None for any other table. Rejected columns are (header, first
+    value that isn't a code).
+    """
+    if len(rows) < 2 or md_blocks.strip_inline(rows[0][0]).strip() != 'Activity':
+        return None
+
+    header = [md_blocks.strip_inline(cell).strip() for cell in rows[0]]
+    body = rows[1:]
+    columns = []
+    parsed = []
+    rejected = []
+    for column in range(1, len(header)):
+        bits = [parse_code(row[column]) if column < len(row) else 0 for row in body]
+        if None in bits:
+            rejected.append((header[column], body[bits.index(None)][column]))
+        else:
+            columns.append(header[column])
+            parsed.append(bits)
+    if not columns:
+        return None
+
+    activities = [md_blocks.strip_inline(row[0]).strip() if row else '' for row in body]
+    return columns, activities, np.array(parsed, dtype=np.uint8).T, rejected
+
+
+def load(source_path):
+    """The RACI model of a markdown file, parsed through the shared parse cache."""
+    import parse_cache
+    return RACIModel.from_blocks(parse_cache.load_blocks(source_path))
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+RACI Overlay
+The effective RACI of every initiative type x tier, from the variation rules of the matrix.
+
+    overlay = raci_overlay.load('RACI-Matrix.md')
+    tier1 = overlay.combination('ai-ml', 1)     # a RACIModel of that initiative's RACI
+    tier1.activities_where('SteerCom', 'A')
+
+The base tables hold every initiative's RACI at once; sections 17 and 18
+of the matrix say which parts apply to which initiative. The overlay reads
+those rules from the tables themselves:
+
+    initiative type  an activity or subsection marked '(AI/ML ...)', '(AI ...)'
+                     or '(Automation ...)' applies only to that type; hybrid
+                     initiatives combine both tracks (17.3)
+    tier rows        an activity marked '(Tier 2)' applies only to that tier
+    footnotes        a code with a footnote naming tiers applies only in them:
+                     'A*' under '*For Tier 1 initiatives' is cleared for Tiers
+                     2 and 3, 'A**' under '**AILead accountable for Tier 2/3;
+                     ...' for Tier 1. Footnotes naming no tier always apply.
+    consultation     rows of the tier table in 18.4 such as 'Risk (C) at
+                     Gates 1, 3': in the gate sections, a role that is only
+                     consulted or informed gets the code at the gates listed
+                     and I at the others
+
+The rest of sections 17 and 18 is guidance for people rather than rules
+over the tables, and is left to the base RACI.
+
+Every combination is computed at once: the masks of each rule are arrays
+over activities x roles, broadcast to initiative types x tiers x
+activities x roles, so all nine combinations of a matrix of tens of
+thousands of activities take a fraction of a second. load() also keeps the
+result in a content cache keyed by the source hash, so an unchanged matrix
+is read back without being parsed.
+"""
+
+import io
+import json
+import os
+import re
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+import md_blocks
+from build_manifest import hash_bytes
+from content_cache import ContentCache
+from raci_model import A, C, FOOTNOTE, FOOTNOTES, I, R, RACIModel
+
+
+# Bump when the rules change, so cached overlays are recomputed
+OVERLAY_VERSION = 1
+
+OVERLAY_CACHE_DIR = Path(__file__).resolve().parent / '.overlay-cache'
+OVERLAY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Initiative type: label, as in section 17
+INITIATIVE_TYPES = {
+    'ai-ml': 'AI/ML',
+    'automation': 'Automation',
+    'hybrid': 'Hybrid',
+}
+TIERS = (1, 2, 3)
+
+LETTERS = R | A | C | I
+
+# '(AI/ML Initiatives)', '(AI initiatives)', '(Automation)', ...
+_TYPE_MARK = re.compile(r'\((AI/ML|AI|Automation)(?:\s[^)]*)?\)')
+_TYPE_NAMES = {'AI/ML': 'ai-ml', 'AI': 'ai-ml', 'Automation': 'automation'}
+_TIER_MARK = re.compile(r'\(Tier (\d)\)')
+_TIER_NAMES = re.compile(r'Tier (\d(?:/\d)*)')
+_GATE = re.compile(r'\bGate (\d+)\b')
+_TIER_HEADER = re.compile(r'^Tier (\d)$')
+# 'Risk (C) at all gates', 'Comply (C) at Gates 1, 4', 'Risk (I) only'
+_CONSULTATION = re.compile(r'^(\w+) \(([CI])\)(?: at (?:all gates|Gates? ([\d,\s]+)))?(?: only)?$')
+
+# role:  role abbreviation
+# tier:  tier the rule applies in
+# code:  C or I, the role's code at gates
+# gates: gate numbers the code applies at, or None for every gate
+ConsultationRule = namedtuple('ConsultationRule', ['role', 'tier', 'code', 'gates'])
+
+
+def combination_title(initiative_type, tier):
+    """A short title for a combination, usable as a sheet or file name, e.g. 'AI-ML Tier 1'."""
+    return f"{INITIATIVE_TYPES[initiative_type].replace('/', '-')} Tier {tier}"
+
+
+def consultation_rules(blocks):
+    """The ConsultationRules of the tier tables (Activity, Tier 1, Tier 2, ...) in parsed blocks."""
+    rules = []
+    for block in blocks:
+        if block.kind != md_blocks.TABLE or len(block.rows) < 2:
+            continue
+        header = [md_blocks.strip_inline(cell).strip() for cell in block.rows[0]]
+        tiers = [_TIER_HEADER.match(cell) for cell in header[1:]]
+        if header[0] != 'Activity' or not all(tiers):
+            continue
+
+        for row in block.rows[1:]:
+            matches = [_CONSULTATION.match(md_blocks.strip_inline(cell).strip()) for cell in row[1:]]
+            if len(matches) != len(tiers) or not all(matches):
+                continue
+            for tier, match in zip(tiers, matches):
+                role, code, gates = match.groups()
+                rules.append(ConsultationRule(role, int(tier.group(1)), code,
+                                              None if gates is None else
+                                              {int(gate) for gate in re.findall(r'\d+', gates)}))
+    return rules
+
+
+class Overlay:
+    """
+    Effective RACI codes of every initiative type x tier.
+
+    model:      the base RACIModel
+    rules:      the ConsultationRules applied
+    applies:    bool array (types x tiers x activities): whether each activity
+                applies to the combination
+    effective:  uint8 array (types x tiers x activities x roles) of assignment
+                bits, footnotes resolved; 0 where an activity doesn't apply
+
+    Types and tiers are indexed in INITIATIVE_TYPES and TIERS order.
+    """
+
+    def __init__(self, model, rules, applies, effective):
+        self.model = model
+        self.rules = list(rules)
+        self.applies = applies
+        self.effective = effective
+
+    @classmethod
+    def from_blocks(cls, blocks):
+        """Compute the overlay of the RACI tables in parsed markdown blocks."""
+        return cls.from_model(RACIModel.from_blocks(blocks), consultation_rules(blocks))
+
+    @classmethod
+    def from_model(cls, model, rules=()):
+        """Compute the overlay of a RACIModel under the given ConsultationRules."""
+        types = list(INITIATIVE_TYPES)
+        tiers = np.array(TIERS)
+
+        # Initiative type: an activity's own mark, else its subsection's
+        subsection_types = [_type_mark(title) for title in model.subsections]
+        activity_types = [_type_mark(activity) or subsection_types[subsection]
+                          for activity, subsection in zip(model.activities, model.subsection_ids)]
+        type_applies = np.array([[scope is None or scope == initiative_type or initiative_type == 'hybrid'
+                                  for scope in activity_types] for initiative_type in types],
+                                dtype=bool).reshape(len(types), len(model))
+
+        # Tier rows
+        activity_tiers = np.array([_tier_mark(activity) for activity in model.activities], dtype=np.int32)
+        tier_applies = (activity_tiers == 0) | (activity_tiers == tiers[:, None])
+
+        # Footnotes: tiers each (table, asterisk count) applies in
+        footnote_tiers = np.ones((max(len(model.footnotes), 1), 4, len(TIERS)), dtype=bool)
+        for table, notes in enumerate(model.footnotes):
+            for stars, text in notes.items():
+                named = _footnote_tiers(text)
+                if named:
+                    footnote_tiers[table, stars] = np.isin(tiers, list(named))
+        stars = (model.codes & FOOTNOTES) // FOOTNOTE
+        keep = footnote_tiers[model.table_ids[:, None], stars]  # activities x roles x tiers
+        codes = np.where(keep, (model.codes & LETTERS)[:, :, None], 0).transpose(2, 0, 1).astype(np.uint8)
+
+        # Consultation at gates
+        section_gates = np.array([_gate(title) for title in model.sections] or [-1], dtype=np.int32)
+        activity_gates = section_gates[model.section_ids]
+        at_gate = activity_gates >= 0
+        for rule in rules:
+            if rule.role not in model.roles or rule.tier not in TIERS:
+                continue
+            tier_codes = codes[TIERS.index(rule.tier), :, model.role(rule.role)]
+            consulted = at_gate & (tier_codes != 0) & ((tier_codes & (R | A)) == 0)
+            listed = consulted if rule.gates is None else consulted & np.isin(activity_gates, list(rule.gates))
+            tier_codes[consulted] = I
+            tier_codes[listed] = C if rule.code == 'C' else I
+
+        applies = type_applies[:, None, :] & tier_applies[None, :, :]
+        effective = np.where(applies[..., None], codes[None], 0).astype(np.uint8)
+        return cls(model, rules, applies, effective)
+
+    def index(self, initiative_type, tier):
+        """(type index, tier index) of a combination."""
+        if initiative_type not in INITIATIVE_TYPES:
+            raise KeyError(f"Unknown initiative type '{initiative_type}' "
+                           f"(types: {', '.join(INITIATIVE_TYPES)})")
+        if tier not in TIERS:
+            raise KeyError(f"Unknown tier {tier} (tiers: {', '.join(map(str, TIERS))})")
+        return list(INITIATIVE_TYPES).index(initiative_type), TIERS.index(tier)
+
+    def combinations(self):
+        """(initiative type, tier) of every combination, in array order."""
+        return [(initiative_type, tier) for initiative_type in INITIATIVE_TYPES for tier in TIERS]
+
+    def combination(self, initiative_type, tier):
+        """The effective RACI of one combination, as a RACIModel of the activities that apply."""
+        type_index, tier_index = self.index(initiative_type, tier)
+        rows = np.flatnonzero(self.applies[type_index, tier_index])
+        model = self.model
+        return RACIModel([model.activities[row] for row in rows], model.roles,
+                         self.effective[type_index, tier_index, rows], model.sections,
+                         model.section_ids[rows], model.subsections, model.subsection_ids[rows],
+                         (), model.table_ids[rows], [{} for _ in model.footnotes])
+
+    def to_bytes(self):
+        """The overlay as .npz bytes, for the cache."""
+        model = self.model
+        buffer = io.BytesIO()
+        np.savez(buffer, applies=self.applies, effective=self.effective, codes=model.codes,
+                 section_ids=model.section_ids, subsection_ids=model.subsection_ids,
+                 table_ids=model.table_ids,
+                 text=np.array(json.dumps({
+                     'activities': model.activities, 'roles': model.roles, 'sections': model.sections,
+                     'subsections': model.subsections, 'rejected_columns': model.rejected_columns,
+                     'footnotes': [list(notes.items()) for notes in model.footnotes],
+                     'rules': [[rule.role, rule.tier, rule.code, None if rule.gates is None else sorted(rule.gates)]
+                               for rule in self.rules],
+                 })))
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        """An overlay from to_bytes(), or None if data isn't one."""
+        try:
+            with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+                text = json.loads(str(arrays['text']))
+                model = RACIModel(text['activities'], text['roles'], arrays['codes'], text['sections'],
+                                  arrays['section_ids'], text['subsections'], arrays['subsection_ids'],
+                                  [tuple(column) for column in text['rejected_columns']],
+                                  arrays['table_ids'], [dict(notes) for notes in text['footnotes']])
+                rules = [ConsultationRule(role, tier, code, None if gates is None else set(gates))
+                         for role, tier, code, gates in text['rules']]
+                return cls(model, rules, arrays['applies'], arrays['effective'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def overlay_cache():
+    """The cache of computed overlays; OVERLAY_CACHE_DIR overrides its location."""
+    directory = os.environ.get('OVERLAY_CACHE_DIR') or OVERLAY_CACHE_DIR
+    return ContentCache(directory, OVERLAY_CACHE_MAX_BYTES, suffix='.npz')
+
+
+def load(source_path):
+    """The Overlay of a markdown file, computed only when the file has changed since last time."""
+    import parse_cache
+
+    with open(source_path, 'rb') as f:
+        data = f.read()
+    cache = overlay_cache()
+    key = f'{hash_bytes(data)}-v{md_blocks.PARSER_VERSION}-o{OVERLAY_VERSION}'
+
+    cached = cache.get(key)
+    overlay = None if cached is None else Overlay.from_bytes(cached)
+    if overlay is None:
+        overlay = Overlay.from_blocks(parse_cache.ParseCache().blocks(data))
+        cache.put(key, overlay.to_bytes())
+        cache.evict()
+    return overlay
+
+
+def _type_mark(text):
+    """The initiative type an activity or subsection title is marked for, or None."""
+    match = _TYPE_MARK.search(text)
+    return None if match is None else _TYPE_NAMES[match.group(1)]
+
+
+def _tier_mark(text):
+    """The tier an activity is marked for, or 0."""
+    match = _TIER_MARK.search(text)
+    return 0 if match is None else int(match.group(1))
+
+
+def _footnote_tiers(text):
+    """The tiers a footnote restricts its codes to: those named before any ';'."""
+    return {int(tier) for names in _TIER_NAMES.findall(text.split(';')[0]) for tier in names.split('/')}
+
+
+def _gate(section_title):
+    """The gate number of a gate section, or -1."""
+    match = _GATE.search(section_title)
+    return -1 if match is None else int(match.group(1))
@@ -2,24 +2,180 @@
 """
 RACI Matrix to Excel Converter
 Converts RACI-Matrix.md to a multi-sheet Excel workbook with professional formatting.
+
+With streaming=True (--stream) the workbook is built in openpyxl's
+write-only mode: each row goes to disk as soon as it is complete, so memory
+stays flat however many activities the matrix has. The formatting is the
+same either way.
+
+Table cells use named styles, one per combination of font, fill, border
+and alignment, so each is defined once in the workbook however many cells
+share it. With color_rules=True (--color-rules) the RACI codes are colored
+by conditional formatting rules over each sheet's RACI ranges instead of
+per-cell fills, so the colors follow codes edited in Excel.
+
+With validation_sheet=True (--validation-sheet) the RACI tables are
+validated (see raci_validation), a summary is printed and the findings are
+listed on a "Validation" sheet; `govdocs raci-validate` checks them without
+building a workbook.
+
+With role='DS' (say) the workbook is that role's view: the same sheets and
+formatting, with only the activities the role is R, A, C or I for.
+convert_per_role() writes every role's view from one parse, across a pool
+of worker processes.
+
+With effective_sheets=True (--effective-sheets) the workbook also has a
+sheet per initiative type x tier, e.g. "AI-ML Tier 1", with the RACI that
+applies to such an initiative once the variation rules of sections 17 and
+18 are applied (see raci_overlay).
 """
 
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import pandas as pd
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Font, PatternFill, Alignment, Border, NamedStyle, Side
+from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.utils.cell import coordinate_from_string
+
+import instrumentation
+import md_blocks
+import ooxml_output
+import parse_cache
+
+
+# A leading section number such as '4.' or '12.3'
+_SECTION_NUMBER = re.compile(r'(\d+(?:\.\d+)*)\.?\s+(.*)')
+
+
+class SectionNotFoundError(KeyError):
+    """A sheet mapping names a section the markdown doesn't have."""
+
+    def __str__(self):
+        return self.args[0]
+
+
+def split_section_title(title):
+    """Split a section title into its number (or None) and its title, lowercased and single-spaced."""
+    match = _SECTION_NUMBER.match(title.strip())
+    number, name = match.groups() if match else (None, title)
+    return number, ' '.join(name.lower().split())
+
+
+class SectionIndex:
+    """
+    Section titles indexed by number and title, ignoring case and spacing.
+
+    '4. Governance Activities RACI' finds the section numbered 4, provided
+    its title matches too; an unnumbered name finds an unnumbered section.
+    """
+
+    def __init__(self, titles):
+        self.numbered = {}    # number: (normalized title, section title)
+        self.unnumbered = {}  # normalized title: section title
+        for title in titles:
+            number, name = split_section_title(title)
+            if number is None:
+                self.unnumbered.setdefault(name, title)
+            else:
+                self.numbered.setdefault(number, (name, title))
+
+    def find(self, section_name):
+        """The title of the section section_name refers to, or None."""
+        number, name = split_section_title(section_name)
+        if number is None:
+            return self.unnumbered.get(name)
+
+        entry = self.numbered.get(number)
+        if entry is not None and entry[0] == name:
+            return entry[1]
+        return None
+
+    def explain_miss(self, section_name):
+        """Why find(section_name) found nothing, for error messages."""
+        number, _ = split_section_title(section_name)
+        if number in self.numbered:
+            return f"section {number} is '{self.numbered[number][1]}'"
+        return 'no section has that number' if number else 'no section has that title'
+
+
+class StreamingSheet:
+    """
+    The part of the Worksheet interface the converter uses, over a write-only sheet.
+
+    Cells must be addressed in row order. A row is written out once a later
+    row is addressed (or on close), so only one row is held in memory; its
+    height, and every column width, must be set before that.
+    """
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.column_dimensions = ws.column_dimensions
+        self.row_dimensions = ws.row_dimensions
+        self.conditional_formatting = ws.conditional_formatting
+        self._rows_written = 0
+        self._row = None
+        self._cells = {}
+
+    def cell(self, row, column):
+        if row != self._row:
+            if row <= self._rows_written:
+                raise ValueError(f"Row {row} of sheet '{self.ws.title}' has already been written")
+            self._flush()
+            self._row = row
+        if column not in self._cells:
+            self._cells[column] = WriteOnlyCell(self.ws)
+        return self._cells[column]
+
+    def __getitem__(self, coordinate):
+        column, row = coordinate_from_string(coordinate)
+        return self.cell(row=row, column=column_index_from_string(column))
+
+    def __setitem__(self, coordinate, value):
+        self[coordinate].value = value
+
+    def merge_cells(self, range_string):
+        self.ws.merged_cells.add(range_string)
+
+    def close(self):
+        """Write out the last row; call before saving the workbook."""
+        self._flush()
+
+    def _flush(self):
+        if self._row is None:
+            return
+        while self._rows_written < self._row - 1:
+            self.ws.append([])
+            self._rows_written += 1
+        self.ws.append([self._cells.get(column) for column in range(1, max(self._cells) + 1)])
+        self._rows_written += 1
+        self._row = None
+        self._cells = {}
 
 
 class RACIExcelConverter:
     """Converts RACI markdown tables to formatted Excel workbook."""
 
-    def __init__(self, md_file_path, output_path):
+    def __init__(self, md_file_path, output_path, compression='default', streaming=False,
+                 color_rules=False, validation_sheet=False, role=None, effective_sheets=False):
         self.md_file_path = Path(md_file_path)
-        self.output_path = Path(output_path)
-        self.wb = Workbook()
-        self.wb.remove(self.wb.active)  # Remove default sheet
+        # A path, a binary file-like object, or None for bytes (see ooxml_output)
+        self.output_path = Path(output_path) if ooxml_output.is_path(output_path) else output_path
+        self.compression = compression  # see ooxml_output
+        self.streaming = streaming
+        self.color_rules = color_rules
+        self.validation_sheet = validation_sheet
+        self.role = role  # role abbreviation to filter activities by, or None for all
+        self.effective_sheets = effective_sheets
+        self.findings = None  # raci_validation Findings, once converted with validation_sheet
+        self.wb = Workbook(write_only=streaming)
+        if not streaming:
+            self.wb.remove(self.wb.active)  # Remove default sheet
+        self.streaming_sheets = []
 
         # Color scheme for RACI values
         self.colors = {
@@ -40,103 +196,165 @@ class RACIExcelConverter:
         thin_border = Side(border_style="thin", color="000000")
         self.border = Border(left=thin_border, right=thin_border, top=thin_border, bottom=thin_border)
 
-    def parse_markdown_table(self, table_text):
-        """Parse a markdown table into a list of lists."""
-        lines = table_text.strip().split('\n')
-        # Remove separator line (the one with |---|---|)
-        lines = [line for line in lines if not re.match(r'^\|[\s\-:|]+\|$', line)]
-
-        rows = []
-        for line in lines:
-            # Split by | and clean up
-            cells = [cell.strip() for cell in line.split('|')[1:-1]]
-            rows.append(cells)
-
-        return rows
+        # Named cell styles, added to the workbook on first use
+        self.cell_styles = {
+            'RACI Header': NamedStyle('RACI Header', font=self.header_font, fill=self.colors['header'],
+                                      border=self.border,
+                                      alignment=Alignment(horizontal='center', vertical='center', wrap_text=True)),
+            'RACI Activity': NamedStyle('RACI Activity', font=self.normal_font, border=self.border,
+                                        alignment=Alignment(horizontal='left', vertical='center', wrap_text=True)),
+            'RACI Code': NamedStyle('RACI Code', font=self.cell_font, border=self.border,
+                                    alignment=Alignment(horizontal='center', vertical='center')),
+        }
+        for code in ('R', 'A', 'C', 'I', 'R/A'):
+            self.cell_styles[f'RACI {code}'] = NamedStyle(f'RACI {code}', font=self.cell_font,
+                                                          fill=self.colors[code], border=self.border,
+                                                          alignment=Alignment(horizontal='center',
+                                                                              vertical='center'))
+        self.added_styles = set()
 
     def extract_tables_from_markdown(self):
-        """Extract all tables from the markdown file organized by section."""
-        with open(self.md_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        """
+        Extract all tables from the markdown file organized by section.
+
+        The markdown is loaded through the shared parse cache, so it is only
+        parsed again when it changes.
+        """
+        return self.sections_from_blocks(parse_cache.load_blocks(self.md_file_path))
 
+    def sections_from_blocks(self, blocks):
+        """Group the tables in parsed markdown blocks by ## section and ### subsection."""
         sections = {}
         current_section = None
         current_subsection = None
 
-        # Split by major sections
-        lines = content.split('\n')
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-
-            # Detect section headers
-            if line.startswith('## '):
-                current_section = line[3:].strip()
+        for block in blocks:
+            if block.kind == md_blocks.HEADING and block.level == 2:
+                current_section = block.text
                 sections[current_section] = {'subsections': {}, 'tables': []}
                 current_subsection = None
-            elif line.startswith('### ') and current_section:
-                current_subsection = line[4:].strip()
+            elif block.kind == md_blocks.HEADING and block.level == 3 and current_section:
+                current_subsection = block.text
                 sections[current_section]['subsections'][current_subsection] = []
-            elif line.startswith('|') and current_section:
-                # Found a table, extract it
-                table_lines = [line]
-                i += 1
-                while i < len(lines) and lines[i].startswith('|'):
-                    table_lines.append(lines[i])
-                    i += 1
-
-                table_text = '\n'.join(table_lines)
-                table_data = self.parse_markdown_table(table_text)
+            elif block.kind == md_blocks.TABLE and current_section:
+                table_data = [list(row) for row in block.rows]
 
                 if current_subsection:
                     sections[current_section]['subsections'][current_subsection].append(table_data)
                 else:
                     sections[current_section]['tables'].append(table_data)
 
-                i -= 1  # Back up one since we'll increment at the end
-
-            i += 1
-
         return sections
 
-    def apply_raci_formatting(self, ws, row, col, value):
-        """Apply color formatting based on RACI value."""
-        cell = ws.cell(row=row, column=col)
-        cell.value = value
-        cell.font = self.cell_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = self.border
+    def sections_for_role(self, sections, role):
+        """A copy of sections with only the RACI table rows where role has R, A, C or I."""
+        from raci_model import parse_code
+
+        def role_rows(table):
+            header = [md_blocks.strip_inline(cell).strip() for cell in table[0]] if table else []
+            if not header or header[0] != 'Activity' or role not in header:
+                return None
+            column = header.index(role)
+            rows = [row for row in table[1:] if column < len(row) and parse_code(row[column])]
+            return [table[0]] + rows if rows else None
+
+        filtered = {}
+        for key, section_data in sections.items():
+            subsections = {}
+            for subsection_name, tables in section_data['subsections'].items():
+                subsections[subsection_name] = [table for table in map(role_rows, tables) if table]
+            filtered[key] = {
+                'subsections': subsections,
+                'tables': [table for table in map(role_rows, section_data['tables']) if table],
+            }
+        return filtered
+
+    def create_sheet(self, title):
+        """Add a worksheet, as a StreamingSheet when streaming."""
+        ws = self.wb.create_sheet(title)
+        if self.streaming:
+            ws = StreamingSheet(ws)
+            self.streaming_sheets.append(ws)
+        return ws
+
+    def set_column_widths(self, ws, column_count):
+        """Widen the activity column and size the RACI columns for column_count columns."""
+        for col in range(1, column_count + 1):
+            if col == 1:
+                ws.column_dimensions[get_column_letter(col)].width = 50
+            else:
+                ws.column_dimensions[get_column_letter(col)].width = 15
+
+    def named_style(self, name):
+        """Return the name of a cell style, adding it to the workbook on first use."""
+        if name not in self.added_styles:
+            self.wb.add_named_style(self.cell_styles[name])
+            self.added_styles.add(name)
+        return name
 
-        # Determine which color to apply
+    def raci_color(self, value):
+        """The colors key for a RACI value, or None if it has no color."""
         value_upper = str(value).upper().strip()
         if value_upper in self.colors:
-            cell.fill = self.colors[value_upper]
+            return value_upper
         elif 'R/A' in value_upper or 'A/R' in value_upper:
-            cell.fill = self.colors['R/A']
+            return 'R/A'
         elif 'R' in value_upper and 'A' in value_upper:
-            cell.fill = self.colors['R/A']
+            return 'R/A'
         elif 'R' in value_upper:
-            cell.fill = self.colors['R']
+            return 'R'
         elif 'A' in value_upper:
-            cell.fill = self.colors['A']
+            return 'A'
         elif 'C' in value_upper:
-            cell.fill = self.colors['C']
+            return 'C'
         elif 'I' in value_upper:
-            cell.fill = self.colors['I']
+            return 'I'
+        return None
+
+    def apply_raci_formatting(self, ws, row, col, value):
+        """Apply color formatting based on RACI value."""
+        cell = ws.cell(row=row, column=col)
+        cell.value = value
+
+        color = None if self.color_rules else self.raci_color(value)
+        cell.style = self.named_style(f'RACI {color}' if color else 'RACI Code')
+
+    def add_color_rules(self, ws, cells):
+        """Color the RACI codes in a range such as 'B5:H20' with conditional formatting, as raci_color does."""
+        anchor = cells.split(':')[0]
+
+        def contains(letter):
+            # Relative to the top-left cell, so the rule applies to each cell of the range
+            return f'ISNUMBER(SEARCH("{letter}",{anchor}))'
+
+        # In raci_color's order; the first matching rule wins
+        conditions = [
+            ('R/A', f'AND({contains("R")},{contains("A")})'),
+            ('R', contains('R')),
+            ('A', contains('A')),
+            ('C', contains('C')),
+            ('I', contains('I')),
+        ]
+        for color, formula in conditions:
+            ws.conditional_formatting.add(cells, FormulaRule(formula=[formula], fill=self.colors[color],
+                                                             stopIfTrue=True))
 
     def write_table_to_sheet(self, ws, table_data, start_row=1):
         """Write a table to a worksheet with formatting."""
         if not table_data:
             return start_row
 
+        # Column widths and row heights first, as streaming sheets write rows out as they go
+        self.set_column_widths(ws, len(table_data[0]))
+        ws.row_dimensions[start_row].height = 30
+        for row in range(start_row + 1, start_row + len(table_data)):
+            ws.row_dimensions[row].height = 25
+
         # Write headers
         for col, header in enumerate(table_data[0], start=1):
             cell = ws.cell(row=start_row, column=col)
             cell.value = header
-            cell.font = self.header_font
-            cell.fill = self.colors['header']
-            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            cell.border = self.border
+            cell.style = self.named_style('RACI Header')
 
         # Write data rows
         for row_idx, row_data in enumerate(table_data[1:], start=start_row + 1):
@@ -144,29 +362,37 @@ class RACIExcelConverter:
                 if col_idx == 1:  # First column (Activity)
                     cell = ws.cell(row=row_idx, column=col_idx)
                     cell.value = cell_value
-                    cell.font = self.normal_font
-                    cell.alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
-                    cell.border = self.border
+                    cell.style = self.named_style('RACI Activity')
                 else:  # RACI columns
                     self.apply_raci_formatting(ws, row_idx, col_idx, cell_value)
 
-        # Auto-adjust column widths
-        for col in range(1, len(table_data[0]) + 1):
-            if col == 1:
-                ws.column_dimensions[get_column_letter(col)].width = 50
-            else:
-                ws.column_dimensions[get_column_letter(col)].width = 15
-
-        # Set row heights
-        ws.row_dimensions[start_row].height = 30
-        for row in range(start_row + 1, start_row + len(table_data)):
-            ws.row_dimensions[row].height = 25
+        # Color the RACI columns by rule rather than by cell fill
+        last_column = max((len(row_data) for row_data in table_data[1:]), default=0)
+        if self.color_rules and last_column > 1:
+            last_row = start_row + len(table_data) - 1
+            self.add_color_rules(ws, f'B{start_row + 1}:{get_column_letter(last_column)}{last_row}')
 
         return start_row + len(table_data) + 2  # Return next available row
 
     def create_overview_sheet(self):
         """Create the overview sheet with role definitions and RACI legend."""
-        ws = self.wb.create_sheet("Overview")
+        from raci_model import ROLE_ABBREVIATIONS
+
+        legend_data = [
+            ['Code', 'Meaning', 'Description'],
+            ['R', 'Responsible', 'Person who does the work to complete the task'],
+            ['A', 'Accountable', 'Person ultimately answerable for the completion and approval'],
+            ['C', 'Consulted', 'Person whose input is sought (two-way communication)'],
+            ['I', 'Informed', 'Person who is kept up-to-date on progress (one-way communication)'],
+            ['R/A', 'Responsible & Accountable', 'Person who both does the work and is accountable']
+        ]
+
+        abbrev_data = [['Abbreviation', 'Full Role', 'Description']]
+        for abbreviation, (role, description) in ROLE_ABBREVIATIONS.items():
+            abbrev_data.append([abbreviation, role, description])
+
+        ws = self.create_sheet("Overview")
+        self.set_column_widths(ws, max(len(legend_data[0]), len(abbrev_data[0])))
 
         # Title
         ws['A1'] = 'RACI Matrix for AI/ML & Automation Initiatives'
@@ -181,55 +407,60 @@ class RACIExcelConverter:
         ws['A4'] = 'RACI Legend'
         ws['A4'].font = Font(name='Calibri', size=14, bold=True)
 
-        legend_data = [
-            ['Code', 'Meaning', 'Description'],
-            ['R', 'Responsible', 'Person who does the work to complete the task'],
-            ['A', 'Accountable', 'Person ultimately answerable for the completion and approval'],
-            ['C', 'Consulted', 'Person whose input is sought (two-way communication)'],
-            ['I', 'Informed', 'Person who is kept up-to-date on progress (one-way communication)'],
-            ['R/A', 'Responsible & Accountable', 'Person who both does the work and is accountable']
-        ]
-
         self.write_table_to_sheet(ws, legend_data, start_row=5)
 
         # Role abbreviations
         ws['A12'] = 'Role Abbreviations'
         ws['A12'].font = Font(name='Calibri', size=14, bold=True)
 
-        abbrev_data = [
-            ['Abbreviation', 'Full Role', 'Description'],
-            ['BizSpon', 'Business Sponsor', 'Senior business leader sponsoring the initiative'],
-            ['BizOwn', 'Business Owner', 'Day-to-day business point of contact'],
-            ['DigProdHead', 'Head of Digital Products', 'Backlog management, requirements, UAT coordination'],
-            ['AILead', 'AI Engineering Lead', 'Head of AI Engineering team'],
-            ['BA', 'Business Analyst', 'Analyzes requirements, documents processes'],
-            ['DS', 'Data Scientist', 'Develops AI/ML models'],
-            ['MLE', 'ML Engineer', 'Implements ML pipelines, handles MLOps'],
-            ['AutoDev', 'Automation Developer', 'Develops RPA bots, automation solutions'],
-            ['SolArch', 'Solution Architect', 'Defines solution architecture'],
-            ['DataEng', 'Data Engineer', 'Builds data pipelines'],
-            ['ModelVal', 'Model Validator', 'Performs independent validation'],
-            ['QA', 'Quality Assurance', 'Tests and validates solutions'],
-            ['ItOps', 'IT Operations', 'Manages production infrastructure'],
-            ['ItSec', 'IT Security', 'Reviews security requirements'],
-            ['ItInfra', 'IT Infrastructure', 'Manages infrastructure'],
-            ['Comply', 'Compliance', 'Ensures regulatory compliance'],
-            ['Risk', 'Risk Management', 'Assesses and manages risks'],
-            ['EntArch', 'Enterprise Architecture', 'Oversees enterprise architecture'],
-            ['DataGov', 'Data Governance', 'Manages data governance'],
-            ['SteerCom', 'Steering Committee', 'Senior governance body for Tier 1 initiatives']
-        ]
-
         self.write_table_to_sheet(ws, abbrev_data, start_row=13)
 
-    def create_sheet_structure(self):
-        """Create the multi-sheet structure with all RACI tables."""
-        sections = self.extract_tables_from_markdown()
+    def widest_table(self, sections, keys):
+        """Number of columns of the widest table in the sections with the given titles."""
+        widest = 0
+        for key in keys:
+            section_data = sections[key]
+            tables = [table for tables in section_data['subsections'].values() for table in tables]
+            for table in tables + section_data['tables']:
+                if table:
+                    widest = max(widest, len(table[0]))
+        return widest
+
+    def resolve_sheet_mapping(self, sheet_mapping, sections):
+        """
+        Map each sheet name to the titles of its sections in sections.
+
+        Raises SectionNotFoundError naming every mapped section that isn't there.
+        """
+        index = SectionIndex(sections)
+        resolved = {}
+        missing = []
+        for sheet_name, section_names in sheet_mapping.items():
+            resolved[sheet_name] = []
+            for section_name in section_names:
+                key = index.find(section_name)
+                if key is None:
+                    missing.append(f"'{section_name}' for sheet '{sheet_name}' "
+                                   f"({index.explain_miss(section_name)})")
+                else:
+                    resolved[sheet_name].append(key)
+
+        if missing:
+            raise SectionNotFoundError(f"Sections not found in {self.md_file_path.name}: " + '; '.join(missing))
+        return resolved
 
-        # Define sheet mapping
+    def create_sheet_structure(self, sections=None):
+        """
+        Create the multi-sheet structure with all RACI tables.
+
+        sections defaults to the tables extracted from the markdown file.
+        """
+        if sections is None:
+            sections = self.extract_tables_from_markdown()
+
+        # Define sheet mapping; '1. Overview' is created separately
         sheet_mapping = {
-            '1. Overview': 'overview',  # Will be created separately
-            '2. Governance': ['4. Strategic & Operational Governance RACI'],
+            '2. Governance': ['4. Governance Activities RACI'],
             '3. Gate 0 - Intake': ['5. Gate 0: Intake & Prioritization RACI'],
             '4. Gate 1 - Discovery': ['6. Gate 1: Discovery & Feasibility RACI'],
             '5. Gate 2 - Design': ['7. Gate 2: Design Phase RACI'],
@@ -244,72 +475,241 @@ class RACIExcelConverter:
             '14. Appendices': ['20. Appendices']
         }
 
+        resolved = self.resolve_sheet_mapping(sheet_mapping, sections)
+
         # Create overview sheet first
         self.create_overview_sheet()
 
         # Create other sheets
-        for sheet_name, section_names in sheet_mapping.items():
-            if sheet_name == '1. Overview':
-                continue
-
-            ws = self.wb.create_sheet(sheet_name)
+        for sheet_name, keys in resolved.items():
+            ws = self.create_sheet(sheet_name)
+            self.set_column_widths(ws, self.widest_table(sections, keys))
             current_row = 1
 
-            for section_name in section_names:
-                # Find matching section
-                for key, section_data in sections.items():
-                    if section_name.lower() in key.lower():
-                        # Write section title
-                        ws.cell(row=current_row, column=1).value = key
-                        ws.cell(row=current_row, column=1).font = Font(name='Calibri', size=14, bold=True, color='2F5496')
-                        current_row += 2
-
-                        # Write subsection tables
-                        for subsection_name, tables in section_data['subsections'].items():
-                            if tables:
-                                # Write subsection name
-                                ws.cell(row=current_row, column=1).value = subsection_name
-                                ws.cell(row=current_row, column=1).font = Font(name='Calibri', size=12, bold=True, color='404040')
-                                current_row += 1
-
-                                # Write each table
-                                for table in tables:
-                                    current_row = self.write_table_to_sheet(ws, table, current_row)
-
-                        # Write section-level tables (if any)
-                        for table in section_data['tables']:
-                            current_row = self.write_table_to_sheet(ws, table, current_row)
+            for key in keys:
+                section_data = sections[key]
 
-                        current_row += 2  # Add spacing between sections
+                # Write section title
+                ws.cell(row=current_row, column=1).value = key
+                ws.cell(row=current_row, column=1).font = Font(name='Calibri', size=14, bold=True, color='2F5496')
+                current_row += 2
 
-    def convert(self):
-        """Main conversion method."""
-        print("Starting RACI to Excel conversion...")
-        print(f"Reading from: {self.md_file_path}")
+                # Write subsection tables
+                for subsection_name, tables in section_data['subsections'].items():
+                    if tables:
+                        # Write subsection name
+                        ws.cell(row=current_row, column=1).value = subsection_name
+                        ws.cell(row=current_row, column=1).font = Font(name='Calibri', size=12, bold=True, color='404040')
+                        current_row += 1
+
+                        # Write each table
+                        for table in tables:
+                            current_row = self.write_table_to_sheet(ws, table, current_row)
 
-        self.create_sheet_structure()
+                # Write section-level tables (if any)
+                for table in section_data['tables']:
+                    current_row = self.write_table_to_sheet(ws, table, current_row)
 
-        # Save the workbook
-        self.wb.save(self.output_path)
-        print(f"✓ Excel workbook created: {self.output_path}")
-        print(f"  File size: {self.output_path.stat().st_size / 1024:.1f} KB")
+                current_row += 2  # Add spacing between sections
 
+    def create_validation_sheet(self, findings):
+        """Create a sheet listing the validation findings, one per row."""
+        ws = self.create_sheet("Validation")
 
-def main():
-    """Main function to convert RACI matrix to Excel."""
-    source_file = Path('/Users/govind/AIEngineering/RACI-Matrix.md')
-    output_file = Path('/Users/govind/AIEngineering/governance-docs-word/RACI-Matrix.xlsx')
+        headers = ['Severity', 'Rule', 'Section', 'Subsection', 'Activity', 'Role', 'Message']
+        widths = [10, 22, 40, 40, 50, 12, 70]
+        for col, width in enumerate(widths, start=1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+        ws.row_dimensions[1].height = 30
 
-    if not source_file.exists():
-        print(f"Error: Source file not found: {source_file}")
-        return
+        for col, header in enumerate(headers, start=1):
+            cell = ws.cell(row=1, column=col)
+            cell.value = header
+            cell.style = self.named_style('RACI Header')
+
+        rows = [[finding.severity, finding.rule, finding.section, finding.subsection, finding.activity,
+                 finding.role, finding.message] for finding in findings]
+        if not rows:
+            rows = [['', '', '', '', '', '', 'No findings']]
+        for row_idx, values in enumerate(rows, start=2):
+            for col, value in enumerate(values, start=1):
+                cell = ws.cell(row=row_idx, column=col)
+                cell.value = value
+                cell.style = self.named_style('RACI Activity')
+
+    def create_effective_sheets(self, overlay):
+        """Create a sheet per initiative type x tier with the effective RACI tables of a raci_overlay.Overlay."""
+        from raci_model import format_code
+        from raci_overlay import combination_title
+
+        model = overlay.model
+
+        # Each table's activity rows, and the roles the base table assigns
+        tables = {}
+        for row, table in enumerate(model.table_ids.tolist()):
+            tables.setdefault(table, []).append(row)
+        columns = {table: [column for column in range(len(model.roles)) if model.codes[rows, column].any()]
+                   for table, rows in tables.items()}
+        widest = max((len(table_columns) + 1 for table_columns in columns.values()), default=0)
+
+        for initiative_type, tier in overlay.combinations():
+            type_index, tier_index = overlay.index(initiative_type, tier)
+            applies = overlay.applies[type_index, tier_index]
+            effective = overlay.effective[type_index, tier_index]
+
+            ws = self.create_sheet(combination_title(initiative_type, tier))
+            self.set_column_widths(ws, widest)
+            current_row = 1
+            section = subsection = None
+
+            for table, rows in tables.items():
+                rows = [row for row in rows if applies[row]]
+                if not rows:
+                    continue
 
-    converter = RACIExcelConverter(source_file, output_file)
-    converter.convert()
+                if model.section_ids[rows[0]] != section:
+                    if section is not None:
+                        current_row += 2  # Add spacing between sections
+                    section = model.section_ids[rows[0]]
+                    subsection = None
+                    ws.cell(row=current_row, column=1).value = model.sections[section]
+                    ws.cell(row=current_row, column=1).font = Font(name='Calibri', size=14, bold=True,
+                                                                   color='2F5496')
+                    current_row += 2
+                if model.subsection_ids[rows[0]] != subsection:
+                    subsection = model.subsection_ids[rows[0]]
+                    if model.subsections[subsection]:
+                        ws.cell(row=current_row, column=1).value = model.subsections[subsection]
+                        ws.cell(row=current_row, column=1).font = Font(name='Calibri', size=12, bold=True,
+                                                                       color='404040')
+                        current_row += 1
+
+                table_data = [['Activity'] + [model.roles[column] for column in columns[table]]]
+                for row in rows:
+                    table_data.append([model.activities[row]] +
+                                      [format_code(int(effective[row, column])) for column in columns[table]])
+                current_row = self.write_table_to_sheet(ws, table_data, current_row)
+
+    def convert(self, blocks=None, model=None):
+        """
+        Main conversion method.
+
+        blocks, if given, are the already-parsed markdown source, and model
+        their RACIModel; the model is only built when a validation or
+        effective sheet needs it. Returns
+        what ooxml_output.save does: the workbook bytes if output_path is
+        None, else output_path.
+        """
+        print("Starting RACI to Excel conversion...")
+        print(f"Reading from: {self.md_file_path}")
 
-    print("\nConversion complete!")
-    print(f"Open the file: {output_file}")
+        with instrumentation.document(ooxml_output.target_name(self.output_path, 'workbook.xlsx'),
+                                     source=str(self.md_file_path)):
+            with instrumentation.stage('parse'):
+                if blocks is None:
+                    blocks = parse_cache.load_blocks(self.md_file_path)
+                sections = self.sections_from_blocks(blocks)
+                if self.role is not None:
+                    sections = self.sections_for_role(sections, self.role)
+
+            # The RACI model and its NumPy arrays are only loaded for the sheets that use them
+            if model is None and (self.validation_sheet or self.effective_sheets):
+                from raci_model import RACIModel
+                model = RACIModel.from_blocks(blocks)
+            if self.validation_sheet:
+                import raci_validation
+                with instrumentation.stage('validate'):
+                    self.findings = raci_validation.validate(model)
+
+            with instrumentation.stage('build'):
+                self.create_sheet_structure(sections)
+                if self.validation_sheet:
+                    self.create_validation_sheet(self.findings)
+                if self.effective_sheets:
+                    from raci_overlay import Overlay, consultation_rules
+                    self.create_effective_sheets(Overlay.from_model(model, consultation_rules(blocks)))
+
+            # Save the workbook
+            with instrumentation.stage('save'):
+                for ws in self.streaming_sheets:
+                    ws.close()
+                saved = ooxml_output.save(self.wb, self.output_path, self.compression)
+        if ooxml_output.is_path(self.output_path):
+            print(f"✓ Excel workbook created: {self.output_path}")
+            print(f"  File size: {self.output_path.stat().st_size / 1024:.1f} KB")
+        else:
+            print("✓ Excel workbook created")
+
+        if self.findings is not None:
+            summary = raci_validation.summarize(self.findings)
+            print(f"  Validation: {summary['errors']} errors, {summary['warnings']} warnings")
+        return saved
+
+
+def convert_per_role(md_file, output_dir, roles=None, jobs=0, compression='default'):
+    """
+    Write one workbook per role, each with only that role's activities.
+
+    The markdown is parsed, and its RACIModel built, once and the
+    workbooks are written by a pool of jobs worker processes (0 = one per
+    CPU core). roles defaults to every role with an assignment in the
+    matrix. Workbooks are named <source name>-<role>.xlsx. Returns a list of (role, output_path, error)
+    tuples in roles order, error being None on success.
+    """
+    from raci_model import RACIModel
+
+    md_file = Path(md_file)
+    output_dir = Path(output_dir)
+    blocks = parse_cache.load_blocks(md_file)
+
+    model = RACIModel.from_blocks(blocks)
+    assigned = [role for column, role in enumerate(model.roles) if model.codes[:, column].any()]
+    if roles is None:
+        roles = assigned
+    unknown = [role for role in roles if role not in assigned]
+    if unknown:
+        raise ValueError(f"No activities in {md_file.name} for roles: {', '.join(unknown)}")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tasks = [(role, output_dir / f'{md_file.stem}-{role}.xlsx') for role in roles]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(tasks) or 1))
+
+    results = []
+    if jobs == 1:
+        for role, output_path in tasks:
+            results.append((role, output_path, _role_job(md_file, blocks, model, role, output_path, compression)))
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=instrumentation.configure,
+                             initargs=instrumentation.settings()) as pool:
+        futures = [pool.submit(_role_job, md_file, blocks, model, role, output_path, compression)
+                   for role, output_path in tasks]
+        for (role, output_path), future in zip(tasks, futures):
+            try:
+                error = future.result()
+            except Exception as e:  # worker process died
+                error = f"{type(e).__name__}: {e}"
+            results.append((role, output_path, error))
+
+    return results
+
+
+def _role_job(md_file, blocks, model, role, output_path, compression):
+    """Pool worker: write one role's workbook and report failure as a message, not a raise."""
+    try:
+        RACIExcelConverter(md_file, output_path, compression, role=role).convert(blocks, model)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def main(argv=None):
+    """Convert the RACI matrix to Excel (the `govdocs raci-xlsx` command)."""
+    import govdocs
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    return govdocs.main(['raci-xlsx', *argv])
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+RACI Validation
+Checks the RACI tables of a matrix against the rules it sets for itself.
+
+    findings = raci_validation.validate(raci_model.load('RACI-Matrix.md'))
+    raci_validation.write_report(findings, 'RACI-Matrix.validation.json', source='RACI-Matrix.md')
+
+Rules (section 2 of the RACI matrix, and the workbook's role list):
+
+    no-accountable        error    an activity without an Accountable
+    multiple-accountable  error    an activity with more than one Accountable
+    no-responsible        warning  an activity without a Responsible
+    unknown-role          warning  a role column not in ROLE_ABBREVIATIONS
+    invalid-code          error    a role column holding something other than R, A, C or I
+
+Each rule is one array operation over the whole RACI model, so only the
+activities that fail cost any Python time, and validating a matrix of tens
+of thousands of activities takes milliseconds.
+"""
+
+import json
+from collections import Counter, namedtuple
+
+import numpy as np
+
+from raci_model import A, R, ROLE_ABBREVIATIONS
+
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# rule:       rule name, as in the module docstring
+# severity:   ERROR or WARNING
+# section, subsection, activity, role: where, '' where not applicable
+# message:    a sentence describing the problem
+Finding = namedtuple('Finding', ['rule', 'severity', 'section', 'subsection', 'activity', 'role', 'message'])
+
+
+def validate(model):
+    """Return the Findings for a RACIModel, activity findings in document order."""
+    findings = []
+
+    accountable = np.count_nonzero(model.codes & A, axis=1)
+    responsible = np.count_nonzero(model.codes & R, axis=1)
+
+    # Flagged rows, in document order, with their rule
+    checks = [
+        ('no-accountable', ERROR, accountable == 0, 'has no Accountable'),
+        ('multiple-accountable', ERROR, accountable > 1, None),
+        ('no-responsible', WARNING, responsible == 0, 'has no Responsible'),
+    ]
+    flagged = []
+    for rule, severity, failed, message in checks:
+        flagged.extend((row, rule, severity, message) for row in np.flatnonzero(failed))
+    flagged.sort(key=lambda entry: entry[0])
+
+    for row, rule, severity, message in flagged:
+        if message is None:
+            roles = [model.roles[column] for column in np.flatnonzero(model.codes[row] & A)]
+            message = f"has {len(roles)} Accountables: {', '.join(roles)}"
+        findings.append(Finding(rule, severity, model.sections[model.section_ids[row]],
+                                model.subsections[model.subsection_ids[row]], model.activities[row], '',
+                                f"'{model.activities[row]}' {message}"))
+
+    for column, role in enumerate(model.roles):
+        if role in ROLE_ABBREVIATIONS:
+            continue
+        for section in np.unique(model.section_ids[model.codes[:, column] != 0]):
+            findings.append(Finding('unknown-role', WARNING, model.sections[section], '', '', role,
+                                    f"Role '{role}' is not one of the role abbreviations"))
+
+    for section, subsection, header, value in model.rejected_columns:
+        findings.append(Finding('invalid-code', ERROR, section, subsection, '', header,
+                                f"Column '{header}' holds '{value}', which is not a RACI code"))
+
+    return findings
+
+
+def summarize(findings):
+    """Counts of findings by severity and by rule."""
+    return {
+        'errors': sum(1 for finding in findings if finding.severity == ERROR),
+        'warnings': sum(1 for finding in findings if finding.severity == WARNING),
+        'by_rule': dict(Counter(finding.rule for finding in findings)),
+    }
+
+
+def report(findings, source=None, model=None):
+    """The machine-readable findings report, as a JSON-serializable dict."""
+    result = {'source': None if source is None else str(source)}
+    if model is not None:
+        result['activities'] = len(model)
+        result['roles'] = model.roles
+    result['summary'] = summarize(findings)
+    result['findings'] = [finding._asdict() for finding in findings]
+    return result
+
+
+def write_report(findings, path, source=None, model=None):
+    """Write the findings report as JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report(findings, source, model), f, indent=2, ensure_ascii=False)
+        f.write('\n')
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Markdown Table Extraction
+Extracts every table of the governance documents into one columnar file.
+
+    table_extract.extract_corpus(['drafts/01-...md', 'RACI-Matrix.md'], 'tables/')
+    pandas.read_parquet('tables/tables.parquet')    # or read_csv('tables/tables.csv')
+
+Tables are stored in long form, one record per table cell, so tables of
+any shape share one schema:
+
+    document    source file name
+    section     ## heading the table is under ('' before the first)
+    subsection  ### heading the table is under ('' for none)
+    table       index of the table in its document, from 0
+    row         index of the body row, from 0 (the header row is not a row)
+    column      index of the column, from 0
+    header      the column's header cell
+    value       the cell
+
+Cell text has its inline markdown (emphasis, code) removed. A table's rows
+are its body rows: filter on document and table, then pivot row x header
+to get it back.
+
+Each document is extracted to its own part file by a pool of worker
+processes, and the parts are concatenated into tables.parquet, or
+tables.csv without pyarrow. Parts are named by their source's stem and a
+short hash of its path, and tracked in a build manifest by the
+hash of their source, so a run only extracts the documents that changed
+since the last one.
+"""
+
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import instrumentation
+import md_blocks
+import parse_cache
+from build_manifest import BuildManifest, hash_bytes
+
+
+# Bump when the extracted records change, so every part is extracted again
+EXTRACTOR_VERSION = 1
+
+PARTS_DIR = 'parts'
+STORE_NAME = 'tables'
+FORMATS = ('parquet', 'csv')
+
+COLUMNS = ['document', 'section', 'subsection', 'table', 'row', 'column', 'header', 'value']
+INDEX_COLUMNS = {'table', 'row', 'column'}
+
+
+def _pyarrow():
+    """The pyarrow module, or None if it isn't installed."""
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def resolve_format(fmt='auto'):
+    """The store format for fmt: 'auto' is parquet with pyarrow installed, csv otherwise."""
+    if fmt == 'auto':
+        return 'parquet' if _pyarrow() is not None else 'csv'
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown table format '{fmt}' (formats: auto, {', '.join(FORMATS)})")
+    if fmt == 'parquet' and _pyarrow() is None:
+        raise ValueError("The parquet format needs pyarrow (pip install pyarrow)")
+    return fmt
+
+
+def extract_tables(blocks, document):
+    """The cell records of every table in parsed markdown blocks, as a dict of COLUMNS lists."""
+    records = {name: [] for name in COLUMNS}
+    section = ''
+    subsection = ''
+    table = 0
+
+    for block in blocks:
+        if block.kind == md_blocks.HEADING and block.level == 2:
+            section = md_blocks.strip_inline(block.text).strip()
+            subsection = ''
+        elif block.kind == md_blocks.HEADING and block.level == 3:
+            subsection = md_blocks.strip_inline(block.text).strip()
+        elif block.kind == md_blocks.TABLE and block.rows:
+            header = [md_blocks.strip_inline(cell).strip() for cell in block.rows[0]]
+            for row, cells in enumerate(block.rows[1:]):
+                for column, cell in enumerate(cells):
+                    records['document'].append(document)
+                    records['section'].append(section)
+                    records['subsection'].append(subsection)
+                    records['table'].append(table)
+                    records['row'].append(row)
+                    records['column'].append(column)
+                    records['header'].append(header[column] if column < len(header) else '')
+                    records['value'].append(md_blocks.strip_inline(cell).strip())
+            table += 1
+
+    return records
+
+
+def encode(records, fmt):
+    """Records as the bytes of a parquet or csv file."""
+    if fmt == 'parquet':
+        pyarrow = _pyarrow()
+        schema = pyarrow.schema([(name, pyarrow.int32() if name in INDEX_COLUMNS else pyarrow.string())
+                                 for name in COLUMNS])
+        buffer = io.BytesIO()
+        pyarrow.parquet.write_table(pyarrow.table(records, schema=schema), buffer)
+        return buffer.getvalue()
+
+    buffer = io.StringIO(newline='')
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    writer.writerows(zip(*(records[name] for name in COLUMNS)))
+    return buffer.getvalue().encode('utf-8')
+
+
+def read(path):
+    """A store or part file (parquet or csv) as a dict of COLUMNS lists."""
+    path = Path(path)
+    if path.suffix == '.parquet':
+        pyarrow = _pyarrow()
+        if pyarrow is None:
+            raise ValueError(f"Reading {path.name} needs pyarrow (pip install pyarrow)")
+        return pyarrow.parquet.read_table(path).to_pydict()
+
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = csv.reader(f)
+        names = next(rows)
+        columns = [list(column) for column in zip(*rows)] or [[] for _ in names]
+    return {name: [int(value) for value in column] if name in INDEX_COLUMNS else column
+            for name, column in zip(names, columns)}
+
+
+def _write(data, path):
+    """Write bytes to path atomically."""
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def part_name(source, fmt):
+    """
+    The part file name of a source: its stem and a short hash of its
+    resolved path, so sources with the same name in different directories
+    get separate parts.
+    """
+    path_hash = hash_bytes(str(Path(source).resolve()).encode('utf-8'))[:8]
+    return f'{Path(source).stem}-{path_hash}.{fmt}'
+
+
+def _extract_job(source, part_path, fmt):
+    """Pool worker: extract one document's part file and report failure as a message, not a raise."""
+    try:
+        with instrumentation.document(part_path.name, source=str(source)):
+            with instrumentation.stage('parse'):
+                blocks = parse_cache.load_blocks(source)
+            with instrumentation.stage('extract'):
+                data = encode(extract_tables(blocks, source.name), fmt)
+            with instrumentation.stage('save'):
+                _write(data, part_path)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def combine(part_paths, store_path, fmt):
+    """Concatenate part files, in order, into the store file."""
+    if not part_paths:
+        _write(encode({name: [] for name in COLUMNS}, fmt), store_path)
+        return
+
+    if fmt == 'parquet':
+        pyarrow = _pyarrow()
+        buffer = io.BytesIO()
+        pyarrow.parquet.write_table(pyarrow.concat_tables([pyarrow.parquet.read_table(path)
+                                                           for path in part_paths]), buffer)
+        _write(buffer.getvalue(), store_path)
+        return
+
+    # CSV parts: one header line, then every part's rows
+    chunks = [(','.join(COLUMNS) + '\r\n').encode('utf-8')]
+    for path in part_paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        chunks.append(data[data.index(b'\n') + 1:])
+    _write(b''.join(chunks), store_path)
+
+
+def extract_corpus(sources, output_dir, jobs=0, fmt='auto', force=False):
+    """
+    Extract the tables of markdown sources into output_dir/tables.<format>.
+
+    Documents unchanged since their last extraction are skipped unless
+    force is set; the others are extracted by a pool of jobs worker
+    processes (0 = one per CPU core). fmt is 'parquet', 'csv' or 'auto'.
+    Returns (store path, results), results being a list of (source, error)
+    tuples for the documents extracted, error being None on success. The
+    store is only rewritten once every document has an up-to-date part.
+    """
+    fmt = resolve_format(fmt)
+    # Each source once, in first-seen order
+    sources = list({Path(source).resolve(): Path(source) for source in sources}.values())
+    output_dir = Path(output_dir)
+    parts_dir = output_dir / PARTS_DIR
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    store_path = output_dir / f'{STORE_NAME}.{fmt}'
+
+    manifest = BuildManifest.for_directory(parts_dir)
+    tasks = []
+    fingerprints = {}
+    for source in sources:
+        part_path = parts_dir / part_name(source, fmt)
+        fingerprint = {
+            'source_sha256': manifest.source_hash(source, part_path),
+            'extractor_version': EXTRACTOR_VERSION,
+            'format': fmt,
+        }
+        fingerprints[source] = fingerprint
+        if force or not manifest.is_up_to_date(part_path, fingerprint):
+            tasks.append((source, part_path))
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(tasks) or 1))
+    results = []
+    if jobs == 1:
+        for source, part_path in tasks:
+            results.append((source, _extract_job(source, part_path, fmt)))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=instrumentation.configure,
+                                 initargs=instrumentation.settings()) as pool:
+            futures = [pool.submit(_extract_job, source, part_path, fmt) for source, part_path in tasks]
+            for (source, _), future in zip(tasks, futures):
+                try:
+                    error = future.result()
+                except Exception as e:  # worker process died
+                    error = f"{type(e).__name__}: {e}"
+                results.append((source, error))
+
+    for (source, part_path), (_, error) in zip(tasks, results):
+        if error is None:
+            manifest.record(part_path, fingerprints[source], source)
+        else:
+            manifest.forget(part_path)
+    manifest.save()
+
+    # The store is rebuilt when its parts, or which documents it holds, change
+    store_manifest = BuildManifest.for_directory(output_dir)
+    store_fingerprint = {
+        'parts': [[part_name(source, fmt), fingerprints[source]['source_sha256']] for source in sources],
+        'extractor_version': EXTRACTOR_VERSION,
+        'format': fmt,
+    }
+    if all(error is None for _, error in results) and \
+            (tasks or not store_manifest.is_up_to_date(store_path, store_fingerprint)):
+        combine([parts_dir / part_name(source, fmt) for source in sources], store_path, fmt)
+        store_manifest.record(store_path, store_fingerprint)
+        store_manifest.save()
+    return store_path, results
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Source Watcher
+Keeps a converter process resident and reconverts sources as they change.
+
+Imports, the cached base .docx and workbook styles stay warm between
+conversions, so a save is turned into updated output in well under a
+second. Changes are detected by polling file size and mtime, which works
+the same on every platform and on network mounts, where inotify-style
+events are often unavailable.
+"""
+
+import argparse
+import time
+from collections import namedtuple
+from functools import partial
+from pathlib import Path
+
+
+DEFAULT_INTERVAL = 0.25
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+# root:     a file, or a directory searched with pattern
+# pattern:  glob pattern for directories (ignored for files)
+# callback: called with the Path of each new or modified source
+WatchRule = namedtuple('WatchRule', ['root', 'pattern', 'callback'])
+
+
+def _stat_key(path):
+    """Size and mtime of a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class SourceWatcher:
+    """Detects new and modified files matched by a set of WatchRules."""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.seen = self._scan()
+
+    def _scan(self):
+        """Map each watched path to (rule, stat key)."""
+        found = {}
+        for rule in self.rules:
+            root = Path(rule.root)
+            paths = sorted(root.glob(rule.pattern)) if root.is_dir() else [root]
+            for path in paths:
+                key = _stat_key(path)
+                if key is not None:
+                    found[path] = (rule, key)
+        return found
+
+    def poll(self):
+        """Return (path, rule) pairs for files changed since the last poll."""
+        current = self._scan()
+        changed = [
+            (path, rule) for path, (rule, key) in current.items()
+            if path not in self.seen or self.seen[path][1] != key
+        ]
+        self.seen = current
+        return changed
+
+
+def watch(rules, interval=DEFAULT_INTERVAL):
+    """Poll until interrupted, running each rule's callback on changed sources."""
+    watcher = SourceWatcher(rules)
+    print(f"Watching {len(watcher.seen)} sources (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            for path, rule in watcher.poll():
+                start = time.perf_counter()
+                try:
+                    rule.callback(path)
+                except Exception as e:
+                    print(f"  ✗ {path.name}: {type(e).__name__}: {e}")
+                    continue
+                print(f"  ✓ {path.name} reconverted in {time.perf_counter() - start:.2f}s")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+def docx_rule(source_dir, output_dir, stream=False, compression='default'):
+    """Rule reconverting changed markdown files in source_dir to .docx, as `govdocs docx` does."""
+    import md_to_docx
+    from build_manifest import BuildManifest
+    from docx_settings import build_fingerprint
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(exist_ok=True)
+
+    def reconvert(md_file):
+        output_path = output_dir / (md_file.stem + '.docx')
+        manifest = BuildManifest.for_directory(output_dir)
+        fingerprint = build_fingerprint(manifest.source_hash(md_file, output_path), compression)
+        if manifest.is_up_to_date(output_path, fingerprint):
+            return
+        md_to_docx.convert_file(md_file, output_path, stream, compression)
+        manifest.record(output_path, fingerprint, md_file)
+        manifest.save()
+
+    # Warm the base document so the first save is as fast as the rest
+    md_to_docx.new_document()
+    return WatchRule(Path(source_dir), '*.md', reconvert)
+
+
+def raci_xlsx_rule(md_file, output_path, **options):
+    """
+    Rule regenerating the RACI workbook when its markdown source changes.
+
+    options are RACIExcelConverter keyword options (compression, streaming,
+    color_rules, ...), so every rebuild matches the first conversion. They
+    are part of the build manifest fingerprint, like the source hash.
+    """
+    from build_manifest import BuildManifest
+    from ooxml_output import source_date_epoch
+    from raci_to_excel import RACIExcelConverter
+
+    output_path = Path(output_path)
+    make_converter = partial(RACIExcelConverter, output_path=output_path, **options)
+
+    def reconvert(path):
+        manifest = BuildManifest.for_directory(output_path.parent)
+        fingerprint = {
+            'renderer': 'raci-xlsx',
+            'source_sha256': manifest.source_hash(path, output_path),
+            'options': options,
+            'source_date_epoch': source_date_epoch(),
+        }
+        if manifest.is_up_to_date(output_path, fingerprint):
+            return
+        make_converter(path).convert()
+        manifest.record(output_path, fingerprint, path)
+        manifest.save()
+
+    return WatchRule(Path(md_file), None, reconvert)
+
+
+def main(argv=None):
+    """Watch the drafts and the RACI matrix, reconverting on every save."""
+    parser = argparse.ArgumentParser(description='Reconvert governance documents whenever a source changes.')
+    parser.add_argument('--drafts-dir', type=Path, default=REPO_ROOT / 'drafts',
+                        help='directory of markdown drafts to convert to .docx')
+    parser.add_argument('--raci', type=Path, default=REPO_ROOT / 'RACI-Matrix.md',
+                        help='RACI matrix markdown, converted to .docx and .xlsx')
+    parser.add_argument('--output-dir', type=Path, default=REPO_ROOT / 'governance-docs-word',
+                        help='directory for generated documents')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help=f'polling interval in seconds (default: {DEFAULT_INTERVAL})')
+    args = parser.parse_args(argv)
+
+    docx = docx_rule(args.drafts_dir, args.output_dir)
+    xlsx = raci_xlsx_rule(args.raci, args.output_dir / (args.raci.stem + '.xlsx'))
+
+    def reconvert_raci(path):
+        docx.callback(path)
+        xlsx.callback(path)
+
+    watch([docx, WatchRule(args.raci, None, reconvert_raci)], args.interval)
+
+
+if __name__ == '__main__':
+    main()